@@ -6,11 +6,49 @@ This script runs benchmarks and outputs results in a format suitable for CI/CD p
 """
 
 import json
+import os
+import signal
 import subprocess
 import sys
+import threading
 import time
+from collections import deque
 from pathlib import Path
 
+import msgpack
+import numpy as np
+import orjson
+import zmq
+
+# Repository root; the Lake package (lakefile.lean) lives here, not in lean/.
+ROOT = Path(__file__).resolve().parents[1]
+
+# Upper bound for `lake build` so a hung build cannot stall CI indefinitely.
+LAKE_BUILD_TIMEOUT = 600  # seconds
+
+# Deadline for bench/lean/TestBench.lean, and how many of its last output
+# lines are kept for the failure message.
+LEAN_BENCH_TIMEOUT = 300  # seconds
+LEAN_OUTPUT_TAIL = 50
+
+# Endpoint probed by check_python_server.
+SERVER_ENDPOINT = "tcp://127.0.0.1:5555"
+
+# How long check_python_server waits for a reply.
+SERVER_CHECK_TIMEOUT_MS = 2000
+
+
+def _kill_process_group(proc):
+    """Kill a process started with start_new_session, and its children
+
+    `lake env lean` runs lean as a child of lake; killing only lake would
+    leave lean holding the output pipe open.
+    """
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
 
 def run_lean_benchmark():
     """Run the Lean-side benchmark"""
@@ -18,26 +56,51 @@ def run_lean_benchmark():
 
     try:
         # Build the Lean project first
-        subprocess.run(["lake", "build"], cwd="lean", check=True)
+        subprocess.run(
+            ["lake", "build"], cwd=ROOT, check=True, timeout=LAKE_BUILD_TIMEOUT
+        )
 
-        # Run the benchmark
-        result = subprocess.run(
-            ["lean", "bench/lean/TestBench.lean"],
-            capture_output=True,
+        # Run the benchmark, streaming its output instead of buffering it.
+        # Only the last lines are kept for the failure message, and a timer
+        # kills the process at the deadline even if it stops printing.
+        proc = subprocess.Popen(
+            ["lake", "env", "lean", "bench/lean/TestBench.lean"],
+            cwd=ROOT,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            timeout=300,  # 5 minute timeout
+            start_new_session=True,
         )
-
-        if result.returncode == 0:
+        timer = threading.Timer(LEAN_BENCH_TIMEOUT, _kill_process_group, [proc])
+        timer.start()
+        tail = deque(maxlen=LEAN_OUTPUT_TAIL)
+        try:
+            for line in proc.stdout:
+                print(line, end="")
+                tail.append(line)
+            returncode = proc.wait(timeout=5)
+        finally:
+            timed_out = not timer.is_alive()
+            timer.cancel()
+            if proc.poll() is None:
+                _kill_process_group(proc)
+
+        if timed_out:
+            raise subprocess.TimeoutExpired(proc.args, LEAN_BENCH_TIMEOUT)
+
+        if returncode == 0:
             print("✓ Lean benchmark completed successfully")
             return True
         else:
-            print(f"✗ Lean benchmark failed: {result.stderr}")
+            print(f"✗ Lean benchmark failed: {''.join(tail)}")
             return False
 
     except subprocess.TimeoutExpired:
         print("✗ Lean benchmark timed out")
         return False
+    except subprocess.CalledProcessError as e:
+        print(f"✗ Lean build failed with exit code {e.returncode}")
+        return False
     except Exception as e:
         print(f"✗ Lean benchmark error: {e}")
         return False
@@ -79,39 +142,59 @@ def run_python_benchmark():
         return False
 
 
-def check_python_server():
-    """Check if Python server is running"""
+def _check_frames():
+    """Encode the server check request once, in the runner's wire format
+
+    A MessagePack header followed by the raw matrix buffer.
+    """
+    matrix = np.array([[1, 2], [3, 4]], dtype=np.uint8)
+    header = {
+        "schema_version": 1,
+        "matrix_shape": list(matrix.shape),
+        "matrix_dtype": str(matrix.dtype),
+        "model": {"name": "TestModel", "version": "1.0"},
+    }
+    return [msgpack.packb(header), matrix.tobytes()]
+
+
+CHECK_FRAMES = _check_frames()
+
+
+def check_python_server(context=None, endpoint=SERVER_ENDPOINT):
+    """Check if Python server is running
+
+    Uses the given ZMQ context, or the process-wide one, and closes only
+    its own socket so the context stays usable for the benchmarks that
+    follow.
+    """
     print("Checking Python server availability...")
 
     try:
-        import zmq
-
-        context = zmq.Context()
+        context = context or zmq.Context.instance()
         socket = context.socket(zmq.REQ)
-        socket.setsockopt(zmq.RCVTIMEO, 2000)  # 2 second timeout
-        socket.connect("tcp://127.0.0.1:5555")
-
-        # Send test request
-        test_payload = {
-            "schema_version": 1,
-            "matrix": [[1, 2], [3, 4]],
-            "model": {"name": "TestModel", "version": "1.0"},
-        }
-
-        socket.send_string(json.dumps(test_payload))
-        response = socket.recv_string()
-        response_data = json.loads(response)
-
-        if response_data.get("status") == "success":
-            print("✓ Python server is responding")
+        socket.setsockopt(zmq.LINGER, 0)
+        socket.connect(endpoint)
+
+        try:
+            socket.send_multipart(CHECK_FRAMES)
+
+            # Wait on a poller rather than RCVTIMEO, so a missing server is
+            # reported as such instead of as a zmq.Again from recv()
+            poller = zmq.Poller()
+            poller.register(socket, zmq.POLLIN)
+            if not poller.poll(SERVER_CHECK_TIMEOUT_MS):
+                print("✗ Python server did not reply in time")
+                return False
+            response_data = orjson.loads(socket.recv())
+
+            if response_data.get("status") == "success":
+                print("✓ Python server is responding")
+                return True
+            else:
+                print("✗ Python server returned error")
+                return False
+        finally:
             socket.close()
-            context.term()
-            return True
-        else:
-            print("✗ Python server returned error")
-            socket.close()
-            context.term()
-            return False
 
     except Exception as e:
         print(f"✗ Python server check failed: {e}")
@@ -127,8 +210,8 @@ def generate_ci_summary():
         "overall_status": "pending",
     }
 
-    # Check server first
-    server_ok = check_python_server()
+    # Check server first, on the context shared with the benchmark clients
+    server_ok = check_python_server(zmq.Context.instance())
     summary["server_status"] = "running" if server_ok else "not_responding"
 
     if not server_ok:
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark Plot Renderer
+
+Post-processes files written by runner.py --save-results into plots, so
+matplotlib never runs inside the benchmark process:
+- benchmark_<ts>.csv: per-request latencies
+- usage_<ts>.csv: CPU / memory samples (optional)
+- summary_<ts>.json: run configuration (optional, used for titles)
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+# Upper bound on points drawn in time-series plots.
+MAX_PLOT_POINTS = 10000
+
+
+def plot_benchmark(csv_file: Path) -> Path:
+    """Render the latency / usage plot for one saved benchmark run"""
+    csv_file = Path(csv_file)
+    timestamp = csv_file.stem.rsplit("_", 1)[-1]
+    usage_file = csv_file.with_name(f"usage_{timestamp}.csv")
+    summary_file = csv_file.with_name(f"summary_{timestamp}.json")
+
+    data = np.loadtxt(csv_file, delimiter=",", skiprows=1, ndmin=2)
+    latencies = data[:, 1]
+
+    if usage_file.exists():
+        usage = np.loadtxt(usage_file, delimiter=",", skiprows=1, ndmin=2)
+        cpu_usage, memory_usage = usage[:, 1], usage[:, 2]
+    else:
+        cpu_usage = memory_usage = np.empty(0)
+
+    title = "Latency Distribution"
+    if summary_file.exists():
+        with open(summary_file) as f:
+            size = json.load(f)["config"]["payload_size"]
+        title += f"\n{size}x{size} Matrix"
+
+    plt.figure(figsize=(12, 8))
+
+    # Latency histogram
+    plt.subplot(2, 2, 1)
+    plt.hist(latencies, bins=50, alpha=0.7, edgecolor="black")
+    plt.xlabel("Latency (ms)")
+    plt.ylabel("Frequency")
+    plt.title(title)
+    mean = latencies.mean()
+    plt.axvline(mean, color="red", linestyle="--", label=f"Mean: {mean:.2f}ms")
+    plt.legend()
+
+    # Latency over time, downsampled to at most MAX_PLOT_POINTS points
+    plt.subplot(2, 2, 2)
+    step = max(1, len(latencies) // MAX_PLOT_POINTS)
+    plt.plot(np.arange(len(latencies))[::step], latencies[::step])
+    plt.xlabel("Request Number")
+    plt.ylabel("Latency (ms)")
+    plt.title("Latency Over Time")
+    plt.yscale("log")
+
+    # CPU usage
+    plt.subplot(2, 2, 3)
+    plt.plot(cpu_usage)
+    plt.xlabel("Sample Number")
+    plt.ylabel("CPU Usage (%)")
+    plt.title("CPU Usage Over Time")
+
+    # Memory usage
+    plt.subplot(2, 2, 4)
+    plt.plot(memory_usage)
+    plt.xlabel("Sample Number")
+    plt.ylabel("Memory Usage (MB)")
+    plt.title("Memory Usage Over Time")
+
+    plt.tight_layout()
+    plot_file = csv_file.with_suffix(".png")
+    plt.savefig(plot_file, dpi=300, bbox_inches="tight")
+    plt.close()
+
+    return plot_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render plots for saved benchmarks")
+    parser.add_argument(
+        "csv_files",
+        nargs="*",
+        type=Path,
+        help="benchmark_<ts>.csv files (default: all in bench/results)",
+    )
+    args = parser.parse_args()
+
+    csv_files = args.csv_files or sorted(Path("bench/results").glob("benchmark_*.csv"))
+    for csv_file in csv_files:
+        print(f"Plot: {plot_benchmark(csv_file)}")
+
+
+if __name__ == "__main__":
+    main()
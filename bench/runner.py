@@ -11,18 +11,42 @@ Measures end-to-end performance characteristics:
 """
 
 import argparse
-import csv
+import gc
+import itertools
 import json
-import statistics
+import math
+import os
+import resource
+import struct
 import time
-import threading
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-import psutil
+from typing import Any, Dict, List, Optional, Tuple
+import msgpack
 import zmq
 import numpy as np
-import matplotlib.pyplot as plt
+import orjson
+
+# Request sequence ids travel as an 8-byte little-endian envelope frame.
+_SEQ = struct.Struct("<Q")
+
+# Requests between CPU/memory samples taken with resource.getrusage.
+USAGE_SAMPLE_EVERY = 100
+
+
+def latency_summary(latencies: np.ndarray) -> Dict[str, float]:
+    """Summarize latencies (ms) with a single percentile pass over the buffer"""
+    p50, p95, p99, p999 = np.percentile(latencies, [50, 95, 99, 99.9])
+    return {
+        "min": float(latencies.min()),
+        "max": float(latencies.max()),
+        "mean": float(latencies.mean()),
+        "median": float(p50),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "p999": float(p999),
+    }
 
 
 @dataclass
@@ -31,9 +55,13 @@ class BenchmarkConfig:
 
     duration: int = 60  # seconds
     payload_size: int = 1000  # elements
+    batch_size: int = 1  # matrices per request
     concurrency: int = 1  # concurrent requests
-    endpoint: str = "tcp://127.0.0.1:5555"
+    # The server also binds this Unix socket, which avoids loopback TCP
+    endpoint: str = "ipc:///tmp/lean_python_bridge.sock"
     timeout_ms: int = 5000
+    rate: float = 0.0  # target requests/s, 0 = unpaced
+    client_cpu: Optional[int] = None  # CPU to pin the client to (Linux only)
     max_retries: int = 3
     save_results: bool = True
     full_suite: bool = False
@@ -44,12 +72,13 @@ class BenchmarkResult:
     """Results from a single benchmark run"""
 
     config: BenchmarkConfig
-    latencies: List[float]
+    latencies: np.ndarray  # ms, one entry per request
     throughput: float
     error_count: int
     total_requests: int
     cpu_usage: List[float]
     memory_usage: List[float]
+    start_time: float
     timestamp: float
 
 
@@ -63,74 +92,142 @@ class LeanPythonBridgeBenchmark:
         self.results_dir.mkdir(exist_ok=True)
         self.profiles_dir.mkdir(exist_ok=True)
 
-        # ZMQ setup
-        self.context = zmq.Context()
-        self.socket = self.context.socket(zmq.REQ)
-        self.socket.setsockopt(zmq.RCVTIMEO, config.timeout_ms)
+        if config.client_cpu is not None:
+            self.pin_client_cpu(config.client_cpu)
+
+        # ZMQ setup: a DEALER socket lets several requests be in flight at
+        # once; replies are matched to requests by sequence id. The context
+        # is the process-wide singleton, shared with any other benchmark.
+        # LINGER=0 keeps close() from blocking on unsent requests, and
+        # IMMEDIATE stops requests from queueing for a peer that is not
+        # connected.
+        self.context = zmq.Context.instance()
+        self.socket = self.context.socket(zmq.DEALER)
+        self.socket.setsockopt(zmq.SNDTIMEO, config.timeout_ms)
+        self.socket.setsockopt(zmq.LINGER, 0)
+        self.socket.setsockopt(zmq.IMMEDIATE, 1)
         self.socket.connect(config.endpoint)
+        self.poller = zmq.Poller()
+        self.poller.register(self.socket, zmq.POLLIN)
+        self._seq = itertools.count()
 
         # Metrics collection
-        self.latencies = []
+        self.latencies = np.empty(0, dtype=np.int64)  # ns
+        self.request_count = 0
         self.errors = []
+        self.cpu_usage = []
+        self.memory_usage = []
+        self._last_usage = None
         self.start_time = None
         self.end_time = None
 
-    def generate_payload(self, size: int) -> Dict:
-        """Generate a test payload of specified size"""
-        return {
+    def pin_client_cpu(self, cpu: int) -> None:
+        """Pin the benchmark process to one CPU to keep migrations out of P99
+
+        Affinity is process-wide, so it also holds for every configuration
+        of a full suite. Platforms without sched_setaffinity run unpinned.
+        """
+        if not hasattr(os, "sched_setaffinity"):
+            print("Warning: CPU pinning is not supported on this platform")
+            return
+        os.sched_setaffinity(0, {cpu})
+
+    def generate_payload(self, size: int, batch: int = 1) -> Tuple[Dict, np.ndarray]:
+        """Generate a test payload of specified size as (metadata, matrix)
+
+        With batch > 1 the frame holds `batch` stacked matrices, shape
+        (batch, size, size), answered by the server in one reply.
+        """
+        # Seeded for reproducible runs; values fit in uint8, which keeps the
+        # frame at one byte per element.
+        rng = np.random.default_rng(0)
+        shape = (batch, size, size) if batch > 1 else (size, size)
+        matrix = rng.integers(0, 100, shape, dtype=np.uint8)
+        meta = {
             "schema_version": 1,
-            "matrix": np.random.randint(0, 100, (size, size)).tolist(),
+            "matrix_shape": list(matrix.shape),
+            "matrix_dtype": str(matrix.dtype),
             "model": {"name": f"BenchmarkModel_{size}", "version": "1.0"},
         }
-
-    def measure_single_request(self, payload: Dict) -> Tuple[float, Optional[str]]:
-        """Measure latency of a single request"""
-        start_time = time.perf_counter()
+        return meta, matrix
+
+    def build_frames(self, meta: Dict, matrix: np.ndarray) -> List[Any]:
+        """Encode a payload once into the message sent by every request
+
+        The message is the reply envelope (a sequence id slot and the empty
+        delimiter) followed by the MessagePack header and the matrix
+        buffer. Only the id slot changes between requests.
+        """
+        return [b"", b"", msgpack.packb(meta, use_bin_type=True), matrix]
+
+    def send_request(self, message: List[Any]) -> int:
+        """Send the prebuilt message tagged with a new sequence id"""
+        seq = next(self._seq)
+        # The server echoes the envelope back unchanged, which is how the
+        # reply is matched to this request.
+        message[0] = _SEQ.pack(seq)
+        self.socket.send_multipart(message, copy=False)
+        return seq
+
+    def receive_reply(self) -> Tuple[int, Optional[str]]:
+        """Receive one pending reply without blocking as (seq, error)"""
+        seq_frame, _, reply = self.socket.recv_multipart(zmq.NOBLOCK)
+        seq = _SEQ.unpack(seq_frame)[0]
 
         try:
-            # Send request
-            self.socket.send_string(json.dumps(payload))
-
-            # Receive response
-            response = self.socket.recv_string()
-            response_data = json.loads(response)
-
-            if response_data.get("status") != "success":
-                return (
-                    time.perf_counter() - start_time,
-                    f"Server error: {response_data}",
-                )
-
-            return time.perf_counter() - start_time, None
-
-        except zmq.error.Again:
-            return time.perf_counter() - start_time, "Timeout"
-        except Exception as e:
-            return time.perf_counter() - start_time, f"Exception: {str(e)}"
-
-    def collect_system_metrics(self) -> Tuple[List[float], List[float]]:
-        """Collect CPU and memory usage during benchmark"""
-        cpu_usage = []
-        memory_usage = []
-
-        def collect_metrics():
-            while self.start_time and time.time() < self.end_time:
-                try:
-                    # Get Python process metrics
-                    python_proc = psutil.Process()
-                    cpu_usage.append(python_proc.cpu_percent())
-                    memory_usage.append(
-                        python_proc.memory_info().rss / 1024 / 1024
-                    )  # MB
-                    time.sleep(0.1)  # Sample every 100ms
-                except (psutil.Error, OSError, RuntimeError):
-                    time.sleep(0.1)
-
-        # Start metrics collection in background thread
-        metrics_thread = threading.Thread(target=collect_metrics, daemon=True)
-        metrics_thread.start()
-
-        return cpu_usage, memory_usage
+            # orjson parses the reply bytes directly
+            response_data = orjson.loads(reply)
+        except orjson.JSONDecodeError as e:
+            return seq, f"Exception: {str(e)}"
+
+        if response_data.get("status") != "success":
+            return seq, f"Server error: {response_data}"
+
+        return seq, None
+
+    def expire_requests(self, inflight: Dict[int, int], timeout_ns: int) -> None:
+        """Fail requests outstanding for longer than the timeout
+
+        `inflight` maps seq to send time in insertion order, so the oldest
+        requests come first. A DEALER socket has no REQ state machine to
+        reset; a late reply is dropped by its unknown seq.
+        """
+        now = time.perf_counter_ns()
+        while inflight:
+            seq, started = next(iter(inflight.items()))
+            if now - started < timeout_ns:
+                break
+            del inflight[seq]
+            self.record_request(now - started, "Timeout")
+
+    def record_request(self, latency_ns: int, error: Optional[str]) -> None:
+        """Store one request outcome in the preallocated latency buffer"""
+        if self.request_count == len(self.latencies):
+            grown = np.empty(2 * len(self.latencies), dtype=np.int64)
+            grown[: self.request_count] = self.latencies
+            self.latencies = grown
+        self.latencies[self.request_count] = latency_ns
+        self.request_count += 1
+        if self.request_count % USAGE_SAMPLE_EVERY == 0:
+            self.sample_usage()
+
+        if error:
+            self.errors.append(error)
+
+    def sample_usage(self) -> None:
+        """Sample CPU% since the previous sample and peak RSS via getrusage"""
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        cpu_time = usage.ru_utime + usage.ru_stime
+        now = time.perf_counter()
+
+        if self._last_usage is not None:
+            last_cpu_time, last_now = self._last_usage
+            if now > last_now:
+                cpu_percent = (cpu_time - last_cpu_time) / (now - last_now) * 100
+                self.cpu_usage.append(cpu_percent)
+                self.memory_usage.append(usage.ru_maxrss / 1024)  # KB -> MB
+
+        self._last_usage = (cpu_time, now)
 
     def run_benchmark(self) -> BenchmarkResult:
         """Run the main benchmark"""
@@ -141,41 +238,105 @@ class LeanPythonBridgeBenchmark:
         self.start_time = time.time()
         self.end_time = self.start_time + self.config.duration
 
-        # Generate payload once
-        payload = self.generate_payload(self.config.payload_size)
-
-        # Start system metrics collection
-        cpu_usage, memory_usage = self.collect_system_metrics()
-
-        # Run benchmark
-        request_count = 0
-        error_count = 0
-
-        while time.time() < self.end_time:
-            latency, error = self.measure_single_request(payload)
-            self.latencies.append(latency * 1000)  # Convert to ms
-
-            if error:
-                self.errors.append(error)
-                error_count += 1
-
-            request_count += 1
+        # Generate payload once; the matrix buffer is reused by every request
+        meta, matrix = self.generate_payload(
+            self.config.payload_size, self.config.batch_size
+        )
+        message = self.build_frames(meta, matrix)
+
+        # System metrics are sampled inline every USAGE_SAMPLE_EVERY requests
+        # rather than from a background thread contending for the GIL
+        self.cpu_usage = []
+        self.memory_usage = []
+        self._last_usage = None
+        self.sample_usage()
+
+        # Run benchmark: keep up to `concurrency` requests in flight and
+        # drain replies as they arrive. After the deadline, stop sending and
+        # wait for the outstanding replies. With --rate, sends are paced
+        # against perf_counter deadlines rather than sleeps.
+        # Latencies are integer nanoseconds from perf_counter_ns, written to
+        # a preallocated buffer that doubles when full; they are converted
+        # to milliseconds once, when the result is built.
+        self.latencies = np.empty(max(1024, self.config.duration * 1000), np.int64)
+        self.request_count = 0
+        self.errors = []
+        inflight: Dict[int, int] = {}
+        timeout_ns = self.config.timeout_ms * 1_000_000
+        interval = 1.0 / self.config.rate if self.config.rate > 0 else 0.0
+        next_send = time.perf_counter()
+
+        # Keep the cyclic GC out of the timed region: a collection
+        # triggered mid-loop shows up as a multi-ms outlier in the tail
+        # percentiles. Long-lived objects are frozen out of the tracked
+        # generations first, and garbage is collected after the loop.
+        gc.collect()
+        gc.freeze()
+        gc.disable()
 
-            # Small delay to prevent overwhelming
-            time.sleep(0.001)
+        try:
+            while time.time() < self.end_time or inflight:
+                sending = time.time() < self.end_time
+                if sending:
+                    while (
+                        len(inflight) < self.config.concurrency
+                        and time.perf_counter() >= next_send
+                    ):
+                        try:
+                            started = time.perf_counter_ns()
+                            inflight[self.send_request(message)] = started
+                        except zmq.Again:
+                            # Send queue stayed full for the whole timeout
+                            self.record_request(timeout_ns, "Timeout")
+                            break
+                        next_send += interval
+
+                # Poll until the next send is due or the oldest request in
+                # flight reaches its deadline, whichever comes first
+                poll_ms = self.config.timeout_ms
+                if sending and interval and len(inflight) < self.config.concurrency:
+                    wait_ms = (next_send - time.perf_counter()) * 1000
+                    poll_ms = min(poll_ms, max(0, int(wait_ms)))
+                if inflight:
+                    oldest = next(iter(inflight.values()))
+                    wait_ms = (oldest + timeout_ns - time.perf_counter_ns()) / 1e6
+                    poll_ms = min(poll_ms, max(0, math.ceil(wait_ms)))
+
+                if self.poller.poll(poll_ms):
+                    while True:
+                        try:
+                            seq, error = self.receive_reply()
+                        except zmq.Again:
+                            break
+
+                        started = inflight.pop(seq, None)
+                        if started is None:
+                            continue
+                        self.record_request(time.perf_counter_ns() - started, error)
+
+                self.expire_requests(inflight, timeout_ns)
+        finally:
+            # Also when the loop raises, so later runs (the rest of a full
+            # suite) are not left with the collector disabled
+            gc.enable()
+            gc.unfreeze()
+        gc.collect()
+
+        self.sample_usage()
 
         # Calculate results
         total_time = time.time() - self.start_time
-        throughput = request_count / total_time
+        throughput = self.request_count / total_time
 
         result = BenchmarkResult(
             config=self.config,
-            latencies=self.latencies,
+            latencies=self.latencies[: self.request_count] * 1e-6,
             throughput=throughput,
-            error_count=error_count,
-            total_requests=request_count,
-            cpu_usage=cpu_usage,
-            memory_usage=memory_usage,
+            error_count=len(self.errors),
+            total_requests=self.request_count,
+            cpu_usage=self.cpu_usage,
+            memory_usage=self.memory_usage,
+            start_time=self.start_time,
             timestamp=time.time(),
         )
 
@@ -196,79 +357,49 @@ class LeanPythonBridgeBenchmark:
                     f"Error rate: {result.error_count/result.total_requests*100:.2f}%\n"
                 )
                 f.write(
-                    f"CPU usage: avg={statistics.mean(result.cpu_usage):.1f}%, max={max(result.cpu_usage):.1f}%\n"
+                    f"CPU usage: avg={np.mean(result.cpu_usage):.1f}%, max={np.max(result.cpu_usage):.1f}%\n"
                 )
                 f.write(
-                    f"Memory usage: avg={statistics.mean(result.memory_usage):.1f}MB, max={max(result.memory_usage):.1f}MB\n"
+                    f"Memory usage: avg={np.mean(result.memory_usage):.1f}MB, max={np.max(result.memory_usage):.1f}MB\n"
                 )
 
         except Exception as e:
             print(f"Warning: Could not generate flamegraph: {e}")
 
-    def save_results(self, result: BenchmarkResult):
-        """Save benchmark results to CSV and generate plots"""
+    def save_results(self, result: BenchmarkResult) -> Path:
+        """Save benchmark results to CSV and JSON; see plot_results.py for plots"""
         timestamp = int(result.timestamp)
 
-        # Save raw data
+        # Save raw data; np.savetxt formats all rows in one call
+        n = len(result.latencies)
+        ids = np.arange(n, dtype=np.int64)
+        timestamps = result.start_time + ids * (result.config.duration / max(n, 1))
         csv_file = self.results_dir / f"benchmark_{timestamp}.csv"
-        with open(csv_file, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["request_id", "latency_ms", "timestamp"])
-            for i, latency in enumerate(result.latencies):
-                writer.writerow(
-                    [
-                        i,
-                        latency,
-                        result.start_time
-                        + (i * result.config.duration / len(result.latencies)),
-                    ]
-                )
-
-        # Generate latency distribution plot
-        plt.figure(figsize=(12, 8))
-
-        # Latency histogram
-        plt.subplot(2, 2, 1)
-        plt.hist(result.latencies, bins=50, alpha=0.7, edgecolor="black")
-        plt.xlabel("Latency (ms)")
-        plt.ylabel("Frequency")
-        plt.title(
-            f"Latency Distribution\n{result.config.payload_size}x{result.config.payload_size} Matrix"
+        np.savetxt(
+            csv_file,
+            np.column_stack([ids, result.latencies, timestamps]),
+            fmt=["%d", "%.4f", "%.6f"],
+            delimiter=",",
+            header="request_id,latency_ms,timestamp",
+            comments="",
         )
-        plt.axvline(
-            statistics.mean(result.latencies),
-            color="red",
-            linestyle="--",
-            label=f"Mean: {statistics.mean(result.latencies):.2f}ms",
+
+        # Save CPU / memory samples for plot_results.py
+        usage_file = self.results_dir / f"usage_{timestamp}.csv"
+        np.savetxt(
+            usage_file,
+            np.column_stack(
+                [
+                    np.arange(len(result.cpu_usage)),
+                    result.cpu_usage,
+                    result.memory_usage,
+                ]
+            ),
+            fmt=["%d", "%.2f", "%.2f"],
+            delimiter=",",
+            header="sample,cpu_percent,memory_mb",
+            comments="",
         )
-        plt.legend()
-
-        # Latency over time
-        plt.subplot(2, 2, 2)
-        plt.plot(result.latencies)
-        plt.xlabel("Request Number")
-        plt.ylabel("Latency (ms)")
-        plt.title("Latency Over Time")
-        plt.yscale("log")
-
-        # CPU usage
-        plt.subplot(2, 2, 3)
-        plt.plot(result.cpu_usage)
-        plt.xlabel("Sample Number")
-        plt.ylabel("CPU Usage (%)")
-        plt.title("CPU Usage Over Time")
-
-        # Memory usage
-        plt.subplot(2, 2, 4)
-        plt.plot(result.memory_usage)
-        plt.xlabel("Sample Number")
-        plt.ylabel("Memory Usage (MB)")
-        plt.title("Memory Usage Over Time")
-
-        plt.tight_layout()
-        plot_file = self.results_dir / f"benchmark_{timestamp}.png"
-        plt.savefig(plot_file, dpi=300, bbox_inches="tight")
-        plt.close()
 
         # Save summary
         summary_file = self.results_dir / f"summary_{timestamp}.json"
@@ -277,30 +408,25 @@ class LeanPythonBridgeBenchmark:
             "config": {
                 "duration": result.config.duration,
                 "payload_size": result.config.payload_size,
+                "batch_size": result.config.batch_size,
                 "concurrency": result.config.concurrency,
                 "endpoint": result.config.endpoint,
             },
             "results": {
                 "total_requests": result.total_requests,
                 "throughput_req_s": result.throughput,
+                # Latencies are per request, i.e. per batch of matrices
+                "throughput_matrices_s": result.throughput * result.config.batch_size,
                 "error_count": result.error_count,
                 "error_rate_percent": result.error_count / result.total_requests * 100,
-                "latency_ms": {
-                    "min": min(result.latencies),
-                    "max": max(result.latencies),
-                    "mean": statistics.mean(result.latencies),
-                    "median": statistics.median(result.latencies),
-                    "p50": np.percentile(result.latencies, 50),
-                    "p95": np.percentile(result.latencies, 95),
-                    "p99": np.percentile(result.latencies, 99),
-                },
+                "latency_ms": latency_summary(result.latencies),
                 "cpu_usage_percent": {
-                    "mean": statistics.mean(result.cpu_usage),
-                    "max": max(result.cpu_usage),
+                    "mean": float(np.mean(result.cpu_usage)),
+                    "max": float(np.max(result.cpu_usage)),
                 },
                 "memory_usage_mb": {
-                    "mean": statistics.mean(result.memory_usage),
-                    "max": max(result.memory_usage),
+                    "mean": float(np.mean(result.memory_usage)),
+                    "max": float(np.max(result.memory_usage)),
                 },
             },
         }
@@ -311,18 +437,32 @@ class LeanPythonBridgeBenchmark:
         print(f"Results saved to {self.results_dir}")
         print(f"Summary: {summary_file}")
         print(f"Raw data: {csv_file}")
-        print(f"Plot: {plot_file}")
+
+        return csv_file
+
+    def plot_results(self, results: List[BenchmarkResult]):
+        """Render plots for saved results once all measurements are done"""
+        # Imported lazily so matplotlib never loads into the measuring process
+        # unless plots were requested.
+        from plot_results import plot_benchmark
+
+        for result in results:
+            csv_file = self.results_dir / f"benchmark_{int(result.timestamp)}.csv"
+            print(f"Plot: {plot_benchmark(csv_file)}")
 
     def run_full_suite(self) -> List[BenchmarkResult]:
         """Run comprehensive benchmark suite"""
         print("Running full benchmark suite...")
 
+        # Scenarios vary size and concurrency; the endpoint, timeout and
+        # other CLI settings carry over from the base configuration
+        base = self.config
         configs = [
-            BenchmarkConfig(duration=30, payload_size=100, concurrency=1),
-            BenchmarkConfig(duration=30, payload_size=1000, concurrency=1),
-            BenchmarkConfig(duration=30, payload_size=10000, concurrency=1),
-            BenchmarkConfig(duration=30, payload_size=1000, concurrency=2),
-            BenchmarkConfig(duration=30, payload_size=1000, concurrency=4),
+            replace(base, duration=30, payload_size=100, concurrency=1),
+            replace(base, duration=30, payload_size=1000, concurrency=1),
+            replace(base, duration=30, payload_size=10000, concurrency=1),
+            replace(base, duration=30, payload_size=1000, concurrency=2),
+            replace(base, duration=30, payload_size=1000, concurrency=4),
         ]
 
         results = []
@@ -331,6 +471,8 @@ class LeanPythonBridgeBenchmark:
                 f"\n--- Testing: {config.payload_size}x{config.payload_size} matrix, {config.concurrency} concurrent ---"
             )
             self.config = config
+            # Start each configuration from a clean heap
+            gc.collect()
             result = self.run_benchmark()
             results.append(result)
 
@@ -341,9 +483,8 @@ class LeanPythonBridgeBenchmark:
         return results
 
     def cleanup(self):
-        """Clean up resources"""
+        """Clean up resources; the shared context is left running"""
         self.socket.close()
-        self.context.term()
 
 
 def main():
@@ -354,31 +495,59 @@ def main():
     parser.add_argument(
         "--payload-size", type=int, default=1000, help="Matrix size (NxN)"
     )
+    parser.add_argument(
+        "--batch",
+        type=int,
+        default=1,
+        help="Matrices packed into each request (default: 1)",
+    )
     parser.add_argument(
         "--concurrency", type=int, default=1, help="Number of concurrent requests"
     )
     parser.add_argument(
-        "--endpoint", default="tcp://127.0.0.1:5555", help="ZMQ endpoint"
+        "--endpoint",
+        default=BenchmarkConfig.endpoint,
+        help="ZMQ endpoint (e.g. tcp://127.0.0.1:5555 for remote servers)",
     )
     parser.add_argument(
         "--timeout", type=int, default=5000, help="Request timeout in ms"
     )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=0.0,
+        help="Target request rate in req/s (default: unpaced)",
+    )
+    parser.add_argument(
+        "--client-cpu",
+        type=int,
+        help="Pin the benchmark client to this CPU (Linux only)",
+    )
     parser.add_argument(
         "--save-results", action="store_true", help="Save results to files"
     )
     parser.add_argument(
         "--full-suite", action="store_true", help="Run full benchmark suite"
     )
+    parser.add_argument(
+        "--plot",
+        action="store_true",
+        help="Render plots after all runs finish (implies --save-results)",
+    )
 
     args = parser.parse_args()
 
     config = BenchmarkConfig(
         duration=args.duration,
         payload_size=args.payload_size,
+        batch_size=args.batch,
         concurrency=args.concurrency,
         endpoint=args.endpoint,
         timeout_ms=args.timeout,
-        save_results=args.save_results,
+        rate=args.rate,
+        client_cpu=args.client_cpu,
+        # Plots are rendered from the saved CSV files
+        save_results=args.save_results or args.plot,
         full_suite=args.full_suite,
     )
 
@@ -388,18 +557,27 @@ def main():
         if args.full_suite:
             results = benchmark.run_full_suite()
             print(f"\nCompleted {len(results)} benchmark configurations")
+
+            if args.plot:
+                benchmark.plot_results(results)
         else:
             result = benchmark.run_benchmark()
             print(f"\nBenchmark completed:")
             print(f"  Total requests: {result.total_requests}")
             print(f"  Throughput: {result.throughput:.2f} req/s")
+            if config.batch_size > 1:
+                matrices_s = result.throughput * config.batch_size
+                print(f"  Matrix throughput: {matrices_s:.2f} matrices/s")
             print(f"  Error rate: {result.error_count/result.total_requests*100:.2f}%")
-            print(f"  P99 latency: {np.percentile(result.latencies, 99):.2f}ms")
+            print(f"  P99 latency: {latency_summary(result.latencies)['p99']:.2f}ms")
 
-            if args.save_results:
+            if config.save_results:
                 benchmark.save_results(result)
                 benchmark.generate_flamegraph(result)
 
+                if args.plot:
+                    benchmark.plot_results([result])
+
     finally:
         benchmark.cleanup()
 
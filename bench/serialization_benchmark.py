@@ -6,10 +6,13 @@ Compares performance of JSON, MessagePack, and Protocol Buffers
 for various payload sizes and types.
 """
 
+import argparse
 import time
+import timeit
 import json
 import msgpack
 import numpy as np
+import psutil
 import matplotlib.pyplot as plt
 from pathlib import Path
 import sys
@@ -20,13 +23,43 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "python", "src"
 
 from codec import SerializationCodec, benchmark_formats, CodecConfig
 
+# One handle for the whole run; psutil.Process() re-reads /proc on creation.
+_PROCESS = psutil.Process()
+
+
+def _to_list(obj):
+    """Fallback for the plain json/msgpack baselines, which cannot encode arrays"""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+def _json_size(data: dict) -> int:
+    """Size of the payload as compact JSON, in bytes"""
+    return len(json.dumps(data, default=_to_list, separators=(",", ":")))
+
+
+def _time_per_call(func) -> float:
+    """Seconds per call of func, averaged over an autoranged loop
+
+    Timer.autorange grows the loop until it runs for at least 0.2 s, so
+    small payloads are not dominated by loop and timer overhead; timeit
+    also keeps the garbage collector off while it measures.
+    """
+    number, total = timeit.Timer(func).autorange()
+    return total / number
+
 
 def generate_test_data(size: int, data_type: str = "matrix") -> dict:
-    """Generate test data of specified size and type"""
+    """Generate test data of specified size and type
+
+    Numeric fields stay NumPy arrays, so the codec can send their raw
+    buffers; the plain json/msgpack baselines convert them to lists.
+    """
     if data_type == "matrix":
         # Generate NxN matrix
         n = int(np.sqrt(size))
-        matrix = np.random.rand(n, n).tolist()
+        matrix = np.random.rand(n, n)
         return {
             "schema_version": 1,
             "matrix": matrix,
@@ -34,7 +67,7 @@ def generate_test_data(size: int, data_type: str = "matrix") -> dict:
         }
     elif data_type == "vector":
         # Generate vector
-        vector = np.random.rand(size).tolist()
+        vector = np.random.rand(size)
         return {
             "schema_version": 1,
             "vector": vector,
@@ -50,9 +83,9 @@ def generate_test_data(size: int, data_type: str = "matrix") -> dict:
                 "session_id": "session_123",
             },
             "data": {
-                "features": np.random.rand(size // 2).tolist(),
-                "labels": np.random.randint(0, 10, size // 2).tolist(),
-                "weights": np.random.rand(size // 4).tolist(),
+                "features": np.random.rand(size // 2),
+                "labels": np.random.randint(0, 10, size // 2),
+                "weights": np.random.rand(size // 4),
             },
             "model": {
                 "name": f"TestModel_{size}",
@@ -64,26 +97,26 @@ def generate_test_data(size: int, data_type: str = "matrix") -> dict:
         raise ValueError(f"Unknown data type: {data_type}")
 
 
-def benchmark_serialization_speed(data: dict, iterations: int = 1000) -> dict:
-    """Benchmark serialization speed for different formats"""
-    print(f"Benchmarking serialization for {len(str(data))} bytes of data...")
+def benchmark_serialization_speed(data: dict, warm_cache: bool = False) -> dict:
+    """Benchmark serialization speed for different formats
+
+    With warm_cache, also time SerializationCodec.serialize_cached: its
+    first call on the payload, and the amortized cost of repeat calls.
+    """
+    print(f"Benchmarking serialization for {_json_size(data)} bytes of data...")
 
     results = {}
 
     # Test JSON
-    start_time = time.perf_counter()
-    for _ in range(iterations):
-        json.dumps(data, separators=(",", ":"))
-    json_time = (time.perf_counter() - start_time) / iterations
-    results["json"] = json_time
+    results["json"] = _time_per_call(
+        lambda: json.dumps(data, default=_to_list, separators=(",", ":"))
+    )
 
     # Test MessagePack
     try:
-        start_time = time.perf_counter()
-        for _ in range(iterations):
-            msgpack.packb(data, use_bin_type=True)
-        msgpack_time = (time.perf_counter() - start_time) / iterations
-        results["msgpack"] = msgpack_time
+        results["msgpack"] = _time_per_call(
+            lambda: msgpack.packb(data, use_bin_type=True, default=_to_list)
+        )
     except Exception as e:
         print(f"MessagePack failed: {e}")
         results["msgpack"] = float("inf")
@@ -91,11 +124,14 @@ def benchmark_serialization_speed(data: dict, iterations: int = 1000) -> dict:
     # Test our codec
     try:
         codec = SerializationCodec()
-        start_time = time.perf_counter()
-        for _ in range(iterations):
-            codec.serialize(data)
-        codec_time = (time.perf_counter() - start_time) / iterations
-        results["codec"] = codec_time
+        results["codec"] = _time_per_call(lambda: codec.serialize(data))
+        if warm_cache:
+            start_time = time.perf_counter()
+            codec.serialize_cached(data, "bench")
+            results["codec_first_call"] = time.perf_counter() - start_time
+            results["codec_cached"] = _time_per_call(
+                lambda: codec.serialize_cached(data, "bench")
+            )
     except Exception as e:
         print(f"Codec failed: {e}")
         results["codec"] = float("inf")
@@ -103,17 +139,20 @@ def benchmark_serialization_speed(data: dict, iterations: int = 1000) -> dict:
     return results
 
 
-def benchmark_deserialization_speed(data: dict, iterations: int = 1000) -> dict:
+def benchmark_deserialization_speed(data: dict) -> dict:
     """Benchmark deserialization speed for different formats"""
-    print(f"Benchmarking deserialization for {len(str(data))} bytes of data...")
+    print(f"Benchmarking deserialization for {_json_size(data)} bytes of data...")
 
     results = {}
 
     # Prepare serialized data
-    json_data = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    # ensure_ascii output is pure ASCII, so the ascii codec suffices
+    json_data = json.dumps(data, default=_to_list, separators=(",", ":")).encode(
+        "ascii"
+    )
 
     try:
-        msgpack_data = msgpack.packb(data, use_bin_type=True)
+        msgpack_data = msgpack.packb(data, use_bin_type=True, default=_to_list)
     except Exception as e:
         print(f"MessagePack serialization failed: {e}")
         msgpack_data = b""
@@ -126,20 +165,14 @@ def benchmark_deserialization_speed(data: dict, iterations: int = 1000) -> dict:
         codec_data = b""
 
     # Test JSON deserialization
-    start_time = time.perf_counter()
-    for _ in range(iterations):
-        json.loads(json_data.decode("utf-8"))
-    json_time = (time.perf_counter() - start_time) / iterations
-    results["json"] = json_time
+    results["json"] = _time_per_call(lambda: json.loads(json_data))
 
     # Test MessagePack deserialization
     if msgpack_data:
         try:
-            start_time = time.perf_counter()
-            for _ in range(iterations):
-                msgpack.unpackb(msgpack_data, raw=False)
-            msgpack_time = (time.perf_counter() - start_time) / iterations
-            results["msgpack"] = msgpack_time
+            results["msgpack"] = _time_per_call(
+                lambda: msgpack.unpackb(msgpack_data, raw=False)
+            )
         except Exception as e:
             print(f"MessagePack deserialization failed: {e}")
             results["msgpack"] = float("inf")
@@ -149,11 +182,7 @@ def benchmark_deserialization_speed(data: dict, iterations: int = 1000) -> dict:
     # Test codec deserialization
     if codec_data:
         try:
-            start_time = time.perf_counter()
-            for _ in range(iterations):
-                codec.deserialize(codec_data)
-            codec_time = (time.perf_counter() - start_time) / iterations
-            results["codec"] = codec_time
+            results["codec"] = _time_per_call(lambda: codec.deserialize(codec_data))
         except Exception as e:
             print(f"Codec deserialization failed: {e}")
             results["codec"] = float("inf")
@@ -165,20 +194,19 @@ def benchmark_deserialization_speed(data: dict, iterations: int = 1000) -> dict:
 
 def benchmark_memory_usage(data: dict, iterations: int = 100) -> dict:
     """Benchmark memory usage for different formats"""
-    print(f"Benchmarking memory usage for {len(str(data))} bytes of data...")
+    print(f"Benchmarking memory usage for {_json_size(data)} bytes of data...")
 
-    import psutil
     import gc
 
     results = {}
+    process = _PROCESS
 
     # Test JSON
     gc.collect()
-    process = psutil.Process()
     mem_before = process.memory_info().rss
 
     for _ in range(iterations):
-        json.dumps(data, separators=(",", ":"))
+        json.dumps(data, default=_to_list, separators=(",", ":"))
 
     gc.collect()
     mem_after = process.memory_info().rss
@@ -190,7 +218,7 @@ def benchmark_memory_usage(data: dict, iterations: int = 100) -> dict:
 
     try:
         for _ in range(iterations):
-            msgpack.packb(data, use_bin_type=True)
+            msgpack.packb(data, use_bin_type=True, default=_to_list)
 
         gc.collect()
         mem_after = process.memory_info().rss
@@ -218,7 +246,7 @@ def benchmark_memory_usage(data: dict, iterations: int = 100) -> dict:
     return results
 
 
-def run_comprehensive_benchmark():
+def run_comprehensive_benchmark(warm_cache: bool = False):
     """Run comprehensive benchmark across different data sizes and types"""
     print("Lean-Python Bridge Serialization Benchmark")
     print("=" * 50)
@@ -238,10 +266,11 @@ def run_comprehensive_benchmark():
 
             # Generate test data
             data = generate_test_data(size, data_type)
+            data_size = _json_size(data)
 
             # Run benchmarks
-            serialization_results = benchmark_serialization_speed(data, 100)
-            deserialization_results = benchmark_deserialization_speed(data, 100)
+            serialization_results = benchmark_serialization_speed(data, warm_cache)
+            deserialization_results = benchmark_deserialization_speed(data)
             memory_results = benchmark_memory_usage(data, 50)
 
             # Store results
@@ -249,16 +278,22 @@ def run_comprehensive_benchmark():
                 "serialization": serialization_results,
                 "deserialization": deserialization_results,
                 "memory": memory_results,
-                "data_size_bytes": len(str(data)),
+                "data_size_bytes": data_size,
             }
 
             # Print summary
-            print(f"  Data size: {len(str(data))} bytes")
+            print(f"  Data size: {data_size} bytes")
             print(
                 f"  Serialization (μs): JSON={serialization_results['json']*1e6:.2f}, "
                 f"MsgPack={serialization_results['msgpack']*1e6:.2f}, "
                 f"Codec={serialization_results['codec']*1e6:.2f}"
             )
+            if warm_cache:
+                print(
+                    "  Cached codec (μs): "
+                    f"first={serialization_results['codec_first_call']*1e6:.2f}, "
+                    f"amortized={serialization_results['codec_cached']*1e6:.2f}"
+                )
             print(
                 f"  Deserialization (μs): JSON={deserialization_results['json']*1e6:.2f}, "
                 f"MsgPack={deserialization_results['msgpack']*1e6:.2f}, "
@@ -383,11 +418,19 @@ def save_results(results: dict):
 
 def main():
     """Main benchmark execution"""
+    parser = argparse.ArgumentParser(description="Serialization format benchmark")
+    parser.add_argument(
+        "--warm-cache",
+        action="store_true",
+        help="Also time serialize_cached: first call vs amortized repeat calls",
+    )
+    args = parser.parse_args()
+
     print("Starting serialization benchmark...")
 
     try:
         # Run comprehensive benchmark
-        results = run_comprehensive_benchmark()
+        results = run_comprehensive_benchmark(args.warm_cache)
 
         # Generate plots
         generate_plots(results)
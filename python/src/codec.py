@@ -5,19 +5,213 @@ Supports multiple serialization formats with automatic selection:
 - JSON: For small control messages and metadata
 - MessagePack: For medium-sized payloads (default)
 - Protocol Buffers: For large structured data
+- Quantized: Optional lossy float16/int8 encoding for large float matrices
+  (not for server requests, whose matrices must be integers)
 """
 
 import json
+import math
 import msgpack
+import numpy as np
+import orjson
 import struct
+import threading
 from google.protobuf.json_format import MessageToDict, ParseDict
 from google.protobuf.struct_pb2 import Struct
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 from dataclasses import dataclass
+from functools import partial
 import logging
 
 logger = logging.getLogger(__name__)
 
+JSON_IMPLS = ("orjson", "json")
+
+# One-byte format header: ids index _ID_TO_FORMAT; unknown ids read as JSON
+_HEADER = struct.Struct("B")
+_ID_TO_FORMAT = (
+    "json",
+    "json",
+    "msgpack",
+    "protobuf",
+    "quantized_f16",
+    "quantized_int8",
+    "split_numeric",
+)
+_FORMAT_TO_ID = {
+    "json": 1,
+    "msgpack": 2,
+    "protobuf": 3,
+    "quantized_f16": 4,
+    "quantized_int8": 5,
+    "split_numeric": 6,
+}
+_FORMAT_HEADERS = {name: _HEADER.pack(fid) for name, fid in _FORMAT_TO_ID.items()}
+
+# Header byte values; none is a valid first byte of a JSON or MessagePack map
+FORMAT_IDS = frozenset(_FORMAT_TO_ID.values())
+
+# Quantized formats: storage dtype of the matrix per format name, and the
+# dequantization scale prefixed to their MessagePack body
+_QUANTIZED_DTYPES = {"quantized_f16": np.float16, "quantized_int8": np.int8}
+_QUANT_SCALE = struct.Struct("<d")
+
+# split_numeric body: metadata length (I), MessagePack metadata
+# [dtype str, shape, rest of the payload], then the raw matrix buffer
+_SPLIT_META_LEN = struct.Struct("<I")
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# String values the JSON decoder maps back to special floats
+_JSON_SPECIAL_FLOATS = {
+    "NaN": float("nan"),
+    "Infinity": float("inf"),
+    "-Infinity": float("-inf"),
+}
+
+# Literals the stdlib encoder writes for special floats, as orjson fragments
+_NAN_FRAGMENT = orjson.Fragment(b"NaN")
+_INF_FRAGMENT = orjson.Fragment(b"Infinity")
+_NEG_INF_FRAGMENT = orjson.Fragment(b"-Infinity")
+
+
+# MessagePack extension type carrying a NumPy array as its raw buffer:
+# dtype string length (B), dtype string, ndim (B), shape (ndim x Q), data
+NDARRAY_EXT_TYPE = 1
+_NDARRAY_BYTE = struct.Struct("<B")
+
+
+def _msgpack_default(obj):
+    """Pack NumPy arrays as raw buffers and other values msgpack rejects"""
+    if isinstance(obj, np.ndarray) and not obj.dtype.hasobject:
+        dtype = obj.dtype.str.encode("ascii")
+        # Raw bytes of the array in C order, viewed rather than copied
+        raw = np.ascontiguousarray(obj).reshape(-1).view(np.uint8)
+        # One join builds the ext body: the array buffer is copied once,
+        # with no intermediate tobytes() copy
+        body = b"".join(
+            [
+                _NDARRAY_BYTE.pack(len(dtype)),
+                dtype,
+                _NDARRAY_BYTE.pack(obj.ndim),
+                struct.pack(f"<{obj.ndim}Q", *obj.shape),
+                raw,
+            ]
+        )
+        return msgpack.ExtType(NDARRAY_EXT_TYPE, body)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, tuple):
+        # strict_types only packs exact lists as arrays
+        return list(obj)
+    raise TypeError(
+        f"Object of type {type(obj).__name__} is not MessagePack serializable"
+    )
+
+
+def _msgpack_ext_hook(code, data):
+    """Rebuild NumPy arrays packed by _msgpack_default as read-only views"""
+    if code != NDARRAY_EXT_TYPE:
+        return msgpack.ExtType(code, data)
+    dtype_len = data[0]
+    dtype = data[1 : 1 + dtype_len].decode("ascii")
+    ndim = data[1 + dtype_len]
+    offset = 2 + dtype_len
+    shape = struct.unpack_from(f"<{ndim}Q", data, offset)
+    return np.frombuffer(data, dtype=dtype, offset=offset + 8 * ndim).reshape(shape)
+
+
+# Packers keep their internal buffer between calls; msgpack.Packer is not
+# thread-safe, so each thread gets its own
+_PACKERS = threading.local()
+
+
+def _packer() -> msgpack.Packer:
+    """Return this thread's reusable MessagePack packer"""
+    try:
+        return _PACKERS.packer
+    except AttributeError:
+        _PACKERS.packer = msgpack.Packer(
+            use_bin_type=True, strict_types=True, default=_msgpack_default
+        )
+        return _PACKERS.packer
+
+
+def _stream_packer() -> msgpack.Packer:
+    """Return this thread's packer that accumulates until reset()"""
+    try:
+        return _PACKERS.stream
+    except AttributeError:
+        _PACKERS.stream = msgpack.Packer(
+            use_bin_type=True,
+            strict_types=True,
+            autoreset=False,
+            default=_msgpack_default,
+        )
+        return _PACKERS.stream
+
+
+def _json_default(obj):
+    """Convert NumPy values for the stdlib encoder (orjson handles them)"""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _fragment_special_floats(obj: Any) -> Any:
+    """Replace non-finite floats with fragments of their JSON literals
+
+    Returns obj itself when it holds no NaN or Infinity, and otherwise a
+    copy of the containers on the path to them.
+    """
+    if isinstance(obj, (float, np.floating)):
+        if math.isfinite(obj):
+            return obj
+        if obj != obj:
+            return _NAN_FRAGMENT
+        return _INF_FRAGMENT if obj > 0 else _NEG_INF_FRAGMENT
+    if isinstance(obj, dict):
+        items = {key: _fragment_special_floats(value) for key, value in obj.items()}
+        if all(items[key] is value for key, value in obj.items()):
+            return obj
+        return items
+    if isinstance(obj, (list, tuple)):
+        try:
+            # Rows of plain numbers are checked in one C-level pass
+            if all(map(math.isfinite, obj)):
+                return obj
+        except (TypeError, OverflowError):
+            pass
+        values = [_fragment_special_floats(value) for value in obj]
+        if all(new is old for new, old in zip(values, obj)):
+            return obj
+        return values
+    if isinstance(obj, np.ndarray) and obj.dtype.kind == "f":
+        if np.isfinite(obj).all():
+            return obj
+        return _fragment_special_floats(obj.tolist())
+    return obj
+
+
+def _has_special_float_strings(data: bytes) -> bool:
+    """Whether JSON bytes may hold "NaN", "Infinity" or "-Infinity" strings
+
+    Single-byte searches run as memchr, so numeric payloads, which contain
+    neither N nor I, are rejected without the slower substring searches.
+    """
+    if b"N" not in data and b"I" not in data:
+        return False
+    # b'Infinity"' also matches "-Infinity"
+    return b'"NaN"' in data or b'Infinity"' in data
+
+
+def _json_hook(obj):
+    """Map special float strings in decoded objects back to floats"""
+    for key, value in obj.items():
+        if isinstance(value, str) and value in _JSON_SPECIAL_FLOATS:
+            obj[key] = _JSON_SPECIAL_FLOATS[value]
+    return obj
+
 
 @dataclass
 class CodecConfig:
@@ -28,6 +222,11 @@ class CodecConfig:
     protobuf_threshold: int = 1000000  # Use Protobuf for payloads >= 1M
     enable_compression: bool = True
     enable_checksums: bool = False
+    json_impl: str = "orjson"  # "orjson" (C encoder) or "json" (stdlib)
+    # Lossy: send float matrices of >= msgpack_threshold elements quantized.
+    # The server only accepts integer request matrices, so it rejects these
+    quantize_large: bool = False
+    quantize_dtype: str = "float16"  # "float16" or "int8" (scaled)
 
 
 class SerializationCodec:
@@ -35,68 +234,189 @@ class SerializationCodec:
 
     def __init__(self, config: CodecConfig = None):
         self.config = config or CodecConfig()
-        self._format_stats = {"json": 0, "msgpack": 0, "protobuf": 0}
+        if self.config.quantize_dtype not in ("float16", "int8"):
+            raise ValueError(
+                f"Unsupported quantization dtype: {self.config.quantize_dtype}"
+            )
+        if self.config.json_impl not in JSON_IMPLS:
+            raise ValueError(
+                f"Unsupported JSON implementation: {self.config.json_impl}"
+            )
+        self._format_stats = dict.fromkeys(_FORMAT_TO_ID, 0)
+        # serialize_cached: key -> (data object, format override, bytes)
+        self._cache: Dict[Any, Tuple[Any, Optional[str], bytes]] = {}
+        # Format name -> bound encoder/decoder, so each call is one dict
+        # lookup instead of a chain of string comparisons
+        self._serializers: Dict[str, Callable[[Any], bytes]] = {
+            "json": self._serialize_json,
+            "msgpack": self._serialize_msgpack,
+            "protobuf": self._serialize_protobuf,
+            "split_numeric": self._serialize_split_numeric,
+        }
+        self._deserializers: Dict[str, Callable[[bytes], Any]] = {
+            "json": self._deserialize_json,
+            "msgpack": self._deserialize_msgpack,
+            "protobuf": self._deserialize_protobuf,
+            "split_numeric": self._deserialize_split_numeric,
+        }
+        # Encoders that write the format header into their own output
+        self._fused_serializers: Dict[str, Callable[[Any], bytes]] = {
+            "msgpack": self._serialize_msgpack_with_header,
+            "split_numeric": partial(
+                self._serialize_split_numeric,
+                header=_FORMAT_HEADERS["split_numeric"],
+            ),
+        }
+        for name in _QUANTIZED_DTYPES:
+            self._serializers[name] = partial(
+                self._serialize_quantized, format_name=name
+            )
+            self._deserializers[name] = self._deserialize_quantized
 
     def _estimate_payload_size(self, data: Any) -> int:
-        """Estimate the number of elements in a payload"""
-        if isinstance(data, (list, tuple)):
-            return len(data)
-        elif isinstance(data, dict):
-            # Count all nested list/tuple elements
-            total = 0
-            for value in data.values():
-                if isinstance(value, (list, tuple)):
-                    total += len(value)
-                elif isinstance(value, dict):
-                    total += self._estimate_payload_size(value)
-            return total
-        return 0
+        """Estimate the number of elements in a payload
+
+        Counts list/tuple lengths and array sizes, descending into nested
+        dicts with an explicit stack instead of recursive calls.
+        """
+        total = 0
+        stack = [data]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, (list, tuple)):
+                total += len(value)
+            elif isinstance(value, np.ndarray):
+                total += value.size
+            elif isinstance(value, dict):
+                stack.extend(value.values())
+        return total
+
+    def _has_arrays(self, data: Any) -> bool:
+        """Check whether a payload holds NumPy arrays, through nested dicts"""
+        if isinstance(data, np.ndarray):
+            return True
+        if isinstance(data, dict):
+            return any(self._has_arrays(value) for value in data.values())
+        return False
 
     def _select_format(self, data: Any) -> str:
         """Automatically select the best serialization format"""
+        matrix = data.get("matrix") if isinstance(data, dict) else None
+        if isinstance(matrix, np.ndarray):
+            # Matrix payloads (serialize_matrix, the bridge protocol) are
+            # sized by the array alone, without walking the rest of the dict
+            if matrix.size < self.config.json_threshold:
+                # JSON has no NaN/Infinity: one vectorized check sends
+                # non-finite matrices as raw buffers instead of through
+                # the stdlib JSON fallback
+                if matrix.dtype.kind in "fc" and not np.isfinite(matrix).all():
+                    return "split_numeric"
+                return "json"
+            if (
+                self.config.quantize_large
+                and matrix.size >= self.config.msgpack_threshold
+                and matrix.dtype.kind == "f"
+            ):
+                if self.config.quantize_dtype == "int8":
+                    return "quantized_int8"
+                return "quantized_f16"
+            if matrix.dtype.hasobject:
+                return "msgpack"
+            return "split_numeric"
+
         payload_size = self._estimate_payload_size(data)
 
         if payload_size < self.config.json_threshold:
             return "json"
-        elif payload_size < self.config.msgpack_threshold:
+        elif payload_size < self.config.msgpack_threshold or self._has_arrays(data):
+            # Arrays travel as raw buffers in MessagePack; a protobuf Struct
+            # would box every element into its own Value message
             return "msgpack"
         else:
             return "protobuf"
 
     def serialize(self, data: Any, format_override: Optional[str] = None) -> bytes:
         """Serialize data using the best available format"""
+        header, payload = self._serialize_frames(data, format_override, True)
+        # Empty when the header was already written into the payload;
+        # concatenating with b"" then returns the payload without a copy
+        return header + payload
+
+    def serialize_cached(
+        self, data: Any, key: Any, format_override: Optional[str] = None
+    ) -> bytes:
+        """Serialize data, reusing the bytes of the last call with this key
+
+        The cached bytes are returned as long as data is the same object,
+        and format_override the same value, as on that call, so callers
+        must not mutate data in between. The cache holds a reference to
+        data until the key is reused or cleared.
+        """
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] is data and cached[1] == format_override:
+            return cached[2]
+        result = self.serialize(data, format_override)
+        self._cache[key] = (data, format_override, result)
+        return result
+
+    def clear_cache(self):
+        """Drop all buffers kept by serialize_cached"""
+        self._cache.clear()
+
+    def serialize_framed(
+        self, data: Any, format_override: Optional[str] = None
+    ) -> Tuple[bytes, bytes]:
+        """Serialize data into separate (format header, payload) frames
+
+        Sending both with socket.send_multipart avoids copying the payload
+        into a single buffer behind the one-byte header.
+        """
+        return self._serialize_frames(data, format_override, False)
+
+    def _serialize_frames(
+        self, data: Any, format_override: Optional[str], fuse_header: bool
+    ) -> Tuple[bytes, bytes]:
+        """Serialize data into (format header, payload)
+
+        With fuse_header, formats that can write their header into their
+        own output buffer do so, and the returned header is empty.
+        """
         selected_format = format_override or self._select_format(data)
 
         try:
-            if selected_format == "json":
-                result = self._serialize_json(data)
-            elif selected_format == "msgpack":
-                result = self._serialize_msgpack(data)
-            elif selected_format == "protobuf":
-                result = self._serialize_protobuf(data)
+            if fuse_header and selected_format in self._fused_serializers:
+                header = b""
+                result = self._fused_serializers[selected_format](data)
             else:
-                raise ValueError(f"Unsupported format: {selected_format}")
-
-            # Add format header
-            header = struct.pack("B", self._format_to_id(selected_format))
+                serializer = self._serializers.get(selected_format)
+                if serializer is None:
+                    raise ValueError(f"Unsupported format: {selected_format}")
+                result = serializer(data)
+                # Add format header
+                header = _FORMAT_HEADERS[selected_format]
             self._format_stats[selected_format] += 1
 
-            element_count = len(data) if hasattr(data, "__len__") else "unknown"
-            logger.debug(
-                "Serialized %s elements using %s",
-                element_count,
-                selected_format,
-            )
-            return header + result
+            if logger.isEnabledFor(logging.DEBUG):
+                element_count = len(data) if hasattr(data, "__len__") else "unknown"
+                logger.debug(
+                    "Serialized %s elements using %s",
+                    element_count,
+                    selected_format,
+                )
+            return header, result
 
         except Exception as e:
             logger.error(f"Serialization failed with {selected_format}: {e}")
+            if selected_format in _QUANTIZED_DTYPES or (
+                selected_format == "split_numeric"
+            ):
+                # e.g. non-finite values for int8: send the exact matrix
+                logger.info("Falling back to MessagePack serialization")
+                return self._serialize_frames(data, "msgpack", fuse_header)
             # Fallback to JSON
             if selected_format != "json":
                 logger.info("Falling back to JSON serialization")
-                return struct.pack(
-                    "B", self._format_to_id("json")
-                ) + self._serialize_json(data)
+                return _FORMAT_HEADERS["json"], self._serialize_json(data)
             raise
 
     def deserialize(self, data: bytes) -> Any:
@@ -104,72 +424,99 @@ class SerializationCodec:
         if len(data) < 1:
             raise ValueError("Data too short to contain format header")
 
-        format_id = struct.unpack("B", data[:1])[0]
+        return self._deserialize_payload(data[0], data[1:])
+
+    def deserialize_framed(self, header: bytes, payload: bytes) -> Any:
+        """Deserialize frames produced by serialize_framed"""
+        if len(header) != 1:
+            raise ValueError("Format header frame must be exactly one byte")
+
+        return self._deserialize_payload(header[0], payload)
+
+    def _deserialize_payload(self, format_id: int, payload: bytes) -> Any:
+        """Deserialize a payload in the format named by its header id"""
         format_name = self._id_to_format(format_id)
-        payload = data[1:]
 
         try:
-            if format_name == "json":
-                return self._deserialize_json(payload)
-            elif format_name == "msgpack":
-                return self._deserialize_msgpack(payload)
-            elif format_name == "protobuf":
-                return self._deserialize_protobuf(payload)
-            else:
-                raise ValueError(f"Unknown format ID: {format_id}")
-
+            # _id_to_format maps unknown ids to JSON, so every name has a decoder
+            return self._deserializers[format_name](payload)
         except Exception as e:
             logger.error(f"Deserialization failed with {format_name}: {e}")
             raise
 
     def _serialize_json(self, data: Any) -> bytes:
-        """Serialize to JSON with special float handling"""
-
-        def json_serializer(obj):
-            if isinstance(obj, float):
-                if obj != obj:  # NaN
-                    return "NaN"
-                elif obj == float("inf"):
-                    return "Infinity"
-                elif obj == float("-inf"):
-                    return "-Infinity"
-            return obj
-
-        return json.dumps(data, default=json_serializer, separators=(",", ":")).encode(
-            "utf-8"
+        """Serialize to JSON with special float handling
+
+        orjson writes NaN and Infinity as null. When the output contains
+        null, those values are swapped for the literals the stdlib encoder
+        would write and the payload is encoded again; nulls from None need
+        no second pass.
+        """
+        if self.config.json_impl == "orjson":
+            try:
+                result = orjson.dumps(data, option=_ORJSON_OPTIONS)
+                if b"null" in result:
+                    special = _fragment_special_floats(data)
+                    if special is not data:
+                        result = orjson.dumps(special, option=_ORJSON_OPTIONS)
+                return result
+            except TypeError:
+                # e.g. integers beyond 64 bits
+                pass
+
+        # ensure_ascii (the default) escapes non-ASCII text, so the ascii
+        # codec suffices and skips the UTF-8 encoder
+        return json.dumps(data, default=_json_default, separators=(",", ":")).encode(
+            "ascii"
         )
 
     def _deserialize_json(self, data: bytes) -> Any:
-        """Deserialize from JSON with special float handling"""
-
-        def json_hook(obj):
-            if isinstance(obj, dict):
-                for key, value in obj.items():
-                    if isinstance(value, str):
-                        if value == "NaN":
-                            obj[key] = float("nan")
-                        elif value == "Infinity":
-                            obj[key] = float("inf")
-                        elif value == "-Infinity":
-                            obj[key] = float("-inf")
-            return obj
+        """Deserialize from JSON with special float handling
 
-        return json.loads(data.decode("utf-8"), object_hook=json_hook)
+        Payloads with NaN/Infinity, as literals or as strings, take the
+        stdlib decoder; everything else is parsed by orjson. orjson reads
+        integers beyond 64 bits as floats; use json_impl="json" for those.
+        Only payloads containing the quoted strings pay for the per-object
+        hook that maps them back to floats.
+        """
+        if _has_special_float_strings(data):
+            return json.loads(data, object_hook=_json_hook)
+
+        if self.config.json_impl == "orjson":
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+
+        return json.loads(data)
 
     def _serialize_msgpack(self, data: Any) -> bytes:
-        """Serialize to MessagePack with special float handling"""
+        """Serialize to MessagePack; NumPy arrays travel as raw buffers
+
+        Unsupported payloads raise, and serialize() falls back to JSON under
+        the JSON header.
+        """
+        return _packer().pack(data)
+
+    def _serialize_msgpack_with_header(self, data: Any) -> bytes:
+        """Serialize to MessagePack behind the msgpack format header
+
+        The header id packs as a MessagePack positive fixint, which is the
+        id byte itself, so packing it first yields header + payload with
+        no concatenation copy.
+        """
+        packer = _stream_packer()
         try:
-            return msgpack.packb(data, use_bin_type=True, strict_types=True)
-        except (TypeError, OverflowError) as e:
-            logger.warning(
-                f"MessagePack serialization failed: {e}, falling back to JSON"
-            )
-            return self._serialize_json(data)
+            packer.pack(_FORMAT_TO_ID["msgpack"])
+            packer.pack(data)
+            return packer.bytes()
+        finally:
+            packer.reset()
 
     def _deserialize_msgpack(self, data: bytes) -> Any:
         """Deserialize from MessagePack"""
         try:
-            return msgpack.unpackb(data, raw=False)
+            return msgpack.unpackb(data, raw=False, ext_hook=_msgpack_ext_hook)
         except Exception as e:
             logger.error(f"MessagePack deserialization failed: {e}")
             raise
@@ -190,13 +537,84 @@ class SerializationCodec:
         msg.ParseFromString(data)
         return MessageToDict(msg)
 
+    def _serialize_split_numeric(
+        self, data: Dict[str, Any], header: bytes = b""
+    ) -> bytes:
+        """Serialize a payload as MessagePack metadata plus its raw matrix
+
+        The matrix buffer is appended as is rather than packed inside the
+        MessagePack body; header, if given, is written in front of it all.
+        """
+        matrix = data["matrix"]
+        if not isinstance(matrix, np.ndarray) or matrix.dtype.hasobject:
+            raise TypeError("split_numeric requires a numeric ndarray matrix")
+
+        rest = {key: value for key, value in data.items() if key != "matrix"}
+        meta = self._serialize_msgpack([matrix.dtype.str, list(matrix.shape), rest])
+        raw = np.ascontiguousarray(matrix).reshape(-1).view(np.uint8)
+        return b"".join([header, _SPLIT_META_LEN.pack(len(meta)), meta, raw.data])
+
+    def _deserialize_split_numeric(self, data: bytes) -> Any:
+        """Deserialize a split_numeric payload; the matrix is a read-only view"""
+        (meta_len,) = _SPLIT_META_LEN.unpack_from(data)
+        start = _SPLIT_META_LEN.size
+        dtype, shape, payload = self._deserialize_msgpack(
+            data[start : start + meta_len]
+        )
+        matrix = np.frombuffer(data, dtype=dtype, offset=start + meta_len)
+        payload["matrix"] = matrix.reshape(shape)
+        return payload
+
+    def _serialize_quantized(self, data: Dict[str, Any], format_name: str) -> bytes:
+        """Serialize a payload with its float matrix quantized (lossy)
+
+        float16 keeps ~3 significant digits and saturates to inf beyond
+        65504; int8 maps the matrix symmetrically onto [-127, 127] with one
+        scale factor. The rest of the payload is packed as MessagePack.
+
+        Meant for float data exchanged outside the request path: the
+        server validates request matrices as integers and answers a
+        quantized request, which decodes to float64, with an error.
+        """
+        matrix = data["matrix"]
+        if not isinstance(matrix, np.ndarray) or matrix.dtype.kind != "f":
+            raise TypeError("Quantized formats require a float ndarray matrix")
+
+        dtype = _QUANTIZED_DTYPES[format_name]
+        scale = 1.0
+        if dtype is np.int8:
+            peak = float(max(matrix.max(initial=0.0), -matrix.min(initial=0.0)))
+            if not np.isfinite(peak):
+                raise ValueError("int8 quantization requires finite values")
+            scale = peak / 127 if peak > 0 else 1.0
+            quantized = np.rint(matrix / scale).astype(np.int8)
+        else:
+            quantized = matrix.astype(np.float16)
+
+        body = self._serialize_msgpack({**data, "matrix": quantized})
+        return _QUANT_SCALE.pack(scale) + body
+
+    def _deserialize_quantized(self, data: bytes) -> Any:
+        """Deserialize a quantized payload; the matrix comes back as float64"""
+        (scale,) = _QUANT_SCALE.unpack_from(data)
+        payload = self._deserialize_msgpack(data[_QUANT_SCALE.size :])
+        quantized = payload["matrix"]
+        if scale != 1.0:
+            # Widen and rescale in one pass, straight into the float64 result
+            payload["matrix"] = np.multiply(quantized, scale, dtype=np.float64)
+        else:
+            payload["matrix"] = quantized.astype(np.float64)
+        return payload
+
     def _format_to_id(self, format_name: str) -> int:
         """Convert format name to ID"""
-        return {"json": 1, "msgpack": 2, "protobuf": 3}.get(format_name, 1)
+        return _FORMAT_TO_ID.get(format_name, 1)
 
     def _id_to_format(self, format_id: int) -> str:
         """Convert format ID to name"""
-        return {1: "json", 2: "msgpack", 3: "protobuf"}.get(format_id, "json")
+        if format_id < len(_ID_TO_FORMAT):
+            return _ID_TO_FORMAT[format_id]
+        return "json"
 
     def get_stats(self) -> Dict[str, int]:
         """Get serialization format usage statistics"""
@@ -204,27 +622,30 @@ class SerializationCodec:
 
     def reset_stats(self):
         """Reset format usage statistics"""
-        self._format_stats = {"json": 0, "msgpack": 0, "protobuf": 0}
+        self._format_stats = dict.fromkeys(_FORMAT_TO_ID, 0)
+
+
+# Convenience functions for common use cases. They share one codec with the
+# default config instead of building a new one (and its dispatch tables) per
+# call; its packers are per thread, so sharing it across threads is safe.
+_DEFAULT_CODEC = SerializationCodec()
 
 
-# Convenience functions for common use cases
 def serialize_matrix(
-    matrix: list, model_info: dict, schema_version: int = 1
+    matrix: Union[list, np.ndarray], model_info: dict, schema_version: int = 1
 ) -> bytes:
-    """Serialize matrix data with automatic format selection"""
-    codec = SerializationCodec()
+    """Serialize a list-of-rows or NumPy matrix with automatic format selection"""
     payload = {
         "schema_version": schema_version,
         "matrix": matrix,
         "model": model_info,
     }
-    return codec.serialize(payload)
+    return _DEFAULT_CODEC.serialize(payload)
 
 
 def deserialize_matrix(data: bytes) -> dict:
     """Deserialize matrix data"""
-    codec = SerializationCodec()
-    return codec.deserialize(data)
+    return _DEFAULT_CODEC.deserialize(data)
 
 
 def benchmark_formats(data: Any, iterations: int = 1000) -> Dict[str, float]:
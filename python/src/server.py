@@ -1,17 +1,29 @@
 import argparse
-import json
+import base64
+import binascii
+import functools
+import itertools
 import logging
 import os
 import signal
+import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import msgpack
 import numpy as np
+import orjson
 import zmq
 from prometheus_client import Counter, Gauge, Histogram, start_http_server
 
-from validation import validate_matrix_model
+from codec import FORMAT_IDS, SerializationCodec
+from validation import (
+    validate_matrix_array,
+    validate_matrix_buffer,
+    validate_matrix_frame,
+    validate_matrix_model,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -20,16 +32,123 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# How often an idle server checks for shutdown and refreshes its gauges
+IDLE_POLL_MS = 500
+
+# Weight of the newest sample in the avg_processing_time moving average
+PROCESSING_TIME_ALPHA = 0.02
+
+# The proxy forwards requests from the frontend to the worker threads' REP
+# sockets here, and is stopped through the control endpoint
+BACKEND_ENDPOINT = "inproc://request-workers"
+CONTROL_ENDPOINT = "inproc://request-proxy-control"
+
+# Health probe sent as a single JSON frame, by Lean and the tests
+HEARTBEAT_REQUEST = b'"HEARTBEAT"'
+
+
+def _usable_cpus() -> List[int]:
+    """CPUs this process may run on (its affinity mask, not the host count)."""
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS / Windows
+        return list(range(os.cpu_count() or 1))
+
+
+def _sum_rows(matrix: List[List[int]]) -> Tuple[float, Tuple[int, int]]:
+    """Sum a validated list-of-rows matrix and return it with its shape.
+
+    The schema only admits integers, so the rows are summed as exact
+    Python ints instead of first converting every element into a
+    float64 array.
+    """
+    rows = len(matrix)
+    cols = len(matrix[0]) if rows else 0
+    if any(len(row) != cols for row in matrix):
+        raise ValueError("Matrix rows must all have the same length")
+    return float(sum(map(sum, matrix))), (rows, cols)
+
+
+@functools.lru_cache(maxsize=None)
+def _sum_limits(dtype: np.dtype) -> Tuple[np.dtype, int]:
+    """Accumulator dtype for summing ``dtype`` elements, and how many fit.
+
+    Integer matrices are summed in int64 (uint64 for unsigned types)
+    rather than converting every element to float64. The second value is
+    the largest element count whose sum cannot overflow that accumulator.
+    """
+    if dtype.kind == "i":
+        max_count = np.iinfo(np.int64).max // (np.iinfo(dtype).max + 1)
+        return np.dtype(np.int64), max_count
+    if dtype.kind == "u":
+        max_count = np.iinfo(np.uint64).max // np.iinfo(dtype).max
+        return np.dtype(np.uint64), max_count
+    return np.dtype(np.float64), 0
+
+
+def _sum_dtype(matrix: np.ndarray) -> np.dtype:
+    """Accumulator dtype for summing ``matrix`` without overflowing."""
+    acc, max_count = _sum_limits(matrix.dtype)
+    if matrix.size <= max_count:
+        return acc
+    # 64-bit integers (or huge matrices) could wrap around
+    return np.dtype(np.float64)
+
+
+def _decode_matrix_bin(matrix_bin: Dict[str, Any]) -> np.ndarray:
+    """Rebuild a validated ``matrix_bin`` matrix as a view on its buffer."""
+    try:
+        buffer = base64.b64decode(matrix_bin["data"], validate=True)
+    except binascii.Error as exc:
+        raise RequestValidationError("matrix_bin data is not base64") from exc
+    shape = (matrix_bin["rows"], matrix_bin["cols"])
+    validate_matrix_buffer(shape, matrix_bin["dtype"], buffer)
+    return np.frombuffer(buffer, dtype=matrix_bin["dtype"]).reshape(shape)
+
+
+def _trusted_version(payload: Dict[str, Any], *_: Any) -> int:
+    """Schema version of a trusted request, taken without validating it."""
+    return payload.get("schema_version", 1)
+
+
+def _trusted_frame(header: Dict[str, Any], buffer: bytes) -> int:
+    """Check only that a trusted binary frame holds the declared matrix."""
+    validate_matrix_buffer(header["matrix_shape"], header["matrix_dtype"], buffer)
+    return header.get("schema_version", 1)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode a JSON reply; orjson writes NumPy scalars without casts"""
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
 
 @dataclass
 class ServerConfig:
     """Server configuration"""
 
     endpoint: str = "tcp://*:5555"
-    request_timeout: int = 5000
+    # Extra endpoint for clients on the same host; empty to disable
+    ipc_endpoint: str = "ipc:///tmp/lean_python_bridge.sock"
+    # Threads handling requests; NumPy releases the GIL while summing.
+    # Sized from the CPUs the process may use, so a container or taskset
+    # limit does not leave more threads than cores contending for the GIL
+    workers: int = min(4, len(_usable_cpus()))
+    # Pin each worker thread to its own CPU, taken every worker_cpu_stride
+    # CPUs from the usable set (0 spreads the workers evenly across it;
+    # 1 packs them onto adjacent CPUs)
+    pin_workers: bool = os.getenv("PIN_WORKERS", "false").lower() == "true"
+    worker_cpu_stride: int = int(os.getenv("WORKER_CPU_STRIDE", "0"))
     enable_metrics: bool = os.getenv("ENABLE_METRICS", "false").lower() == "true"
     metrics_port: int = int(os.getenv("METRICS_PORT", "8000"))
     enable_curve: bool = os.getenv("ENABLE_CURVE", "false").lower() == "true"
+    # Skip JSON-Schema validation for clients known to send well-formed
+    # requests; binary buffers are still checked against their header
+    trust_clients: bool = os.getenv("TRUST_CLIENTS", "false").lower() == "true"
+
+    def __post_init__(self):
+        # Without a worker the proxy accepts requests that are never answered
+        if self.workers < 1:
+            raise ValueError(f"workers must be at least 1, got {self.workers}")
 
 
 class RequestValidationError(Exception):
@@ -41,16 +160,52 @@ class TransportError(Exception):
 
 
 class AdvancedServer:
-    """Production-grade REQ/REP server with metrics and typed errors."""
+    """Production-grade ROUTER server with metrics and typed errors.
+
+    Speaks the REQ/REP protocol: REQ and DEALER clients send an envelope
+    ending in an empty delimiter frame, and get it back on the reply.
+    """
 
     def __init__(self, config: ServerConfig):
         self.config = config
         self.context = zmq.Context()
         self.frontend = None
+        self.backend = None
+        # Control pair for the proxy: it reads one end, cleanup() writes the other
+        self._proxy_control = None
+        self._control = None
+        self._proxy_thread: Optional[threading.Thread] = None
+        self._workers: List[threading.Thread] = []
+        # Decodes requests that start with a codec format header byte
+        self.codec = SerializationCodec()
+        # Validators return the request's schema version
+        self._validate_model: Callable[..., int]
+        self._validate_frame: Callable[..., int]
+        self._validate_array: Callable[..., int]
+        if config.trust_clients:
+            self._validate_model = _trusted_version
+            self._validate_frame = _trusted_frame
+            self._validate_array = _trusted_version
+        else:
+            self._validate_model = validate_matrix_model
+            self._validate_frame = validate_matrix_frame
+            self._validate_array = validate_matrix_array
+        self._server_id = f"server_{id(self)}"
+        # JSON heartbeat replies only vary in their timestamp, written last
+        self._heartbeat_prefix = (
+            b'{"status":"heartbeat_ack","server_id":"%s","timestamp":'
+            % self._server_id.encode()
+        )
+        # CPU per worker thread when pin_workers is set
+        self._worker_cpus: List[int] = []
+        self._worker_ids = itertools.count()
         self.running = False
+        # Request outcomes are recorded from the worker threads
+        self._metrics_lock = threading.Lock()
         self.start_time = time.time()
-        self.processing_time_total = 0.0
-        self.processing_count = 0
+        # Moving average of processing time in seconds; workers update it
+        # without the lock since a lost sample only nudges the average
+        self._processing_time_ewma = 0.0
         self.metrics = {
             "requests_total": 0,
             "requests_success": 0,
@@ -63,23 +218,43 @@ class AdvancedServer:
         self._requests_success = Counter(
             "requests_success", "Total number of successful requests"
         )
-        self._requests_error = Counter("requests_error", "Total number of failed requests")
+        self._requests_error = Counter(
+            "requests_error", "Total number of failed requests"
+        )
         self._request_duration = Histogram(
             "request_duration_seconds", "Request processing duration in seconds"
         )
-        self._uptime_seconds = Gauge("server_uptime_seconds", "Server uptime in seconds")
+        self._uptime_seconds = Gauge(
+            "server_uptime_seconds", "Server uptime in seconds"
+        )
 
     def setup_sockets(self):
         """Setup server socket."""
-        self.frontend = self.context.socket(zmq.REP)
-        self.frontend.setsockopt(zmq.RCVTIMEO, self.config.request_timeout)
-        self.frontend.bind(self.config.endpoint)
+        self.frontend = self.context.socket(zmq.ROUTER)
+        endpoints = [self.config.endpoint]
+        # Local clients skip the loopback TCP stack over a Unix socket
+        if self.config.ipc_endpoint and zmq.has("ipc"):
+            endpoints.append(self.config.ipc_endpoint)
+        bound = []
+        for endpoint in endpoints:
+            self.frontend.bind(endpoint)
+            # Resolves the port the OS picked for tcp://host:0
+            bound.append(self.frontend.get(zmq.LAST_ENDPOINT).decode())
+
+        # Worker threads connect REP sockets here; the DEALER hands each
+        # request to the next worker and routes its reply back
+        self.backend = self.context.socket(zmq.DEALER)
+        self.backend.bind(BACKEND_ENDPOINT)
+        self._proxy_control = self.context.socket(zmq.PAIR)
+        self._proxy_control.bind(CONTROL_ENDPOINT)
+        self._control = self.context.socket(zmq.PAIR)
+        self._control.connect(CONTROL_ENDPOINT)
 
         # Setup CURVE if enabled
         if self.config.enable_curve:
             self._setup_curve()
 
-        logger.info(f"Server sockets bound to {self.config.endpoint}")
+        logger.info(f"Server sockets bound to {', '.join(bound)}")
 
     def _setup_curve(self):
         """Setup CURVE encryption"""
@@ -105,12 +280,37 @@ class AdvancedServer:
 
             if self.config.enable_metrics:
                 start_http_server(self.config.metrics_port)
-                logger.info("Prometheus metrics endpoint started on :%s", self.config.metrics_port)
+                logger.info(
+                    "Prometheus metrics endpoint started on :%s",
+                    self.config.metrics_port,
+                )
+
+            if self.config.pin_workers:
+                self._worker_cpus = self._plan_worker_cpus()
+                logger.info("Pinning workers to CPUs %s", self._worker_cpus)
+            for i in range(self.config.workers):
+                worker = threading.Thread(
+                    target=self._worker_loop, name=f"request-worker-{i}", daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+            self._proxy_thread = threading.Thread(
+                target=self._run_proxy, name="request-proxy", daemon=True
+            )
+            self._proxy_thread.start()
 
-            logger.info("Advanced server started successfully")
+            logger.info(
+                "Advanced server started successfully (%d workers)",
+                self.config.workers,
+            )
+            if self.config.trust_clients:
+                logger.warning("Request schema validation is disabled")
 
-            # Main event loop
-            self._main_loop()
+            # Requests never pass through this thread; it only waits for
+            # shutdown and refreshes the gauges
+            while self.running:
+                time.sleep(IDLE_POLL_MS / 1000)
+                self._update_metrics()
 
         except Exception as e:
             logger.error(f"Server error: {e}")
@@ -118,44 +318,140 @@ class AdvancedServer:
         finally:
             self.cleanup()
 
-    def _main_loop(self):
-        """Main REQ/REP loop."""
-        while self.running:
-            try:
-                request = self.frontend.recv()
-                started = time.perf_counter()
-                response = self._handle_request(request)
-                elapsed = time.perf_counter() - started
-                self._request_duration.observe(elapsed)
-                self.processing_time_total += elapsed
-                self.processing_count += 1
-                self._update_metrics()
-                self.frontend.send(response)
+    def _plan_worker_cpus(self) -> List[int]:
+        """Choose one CPU per worker thread from the usable CPUs."""
+        cpus = _usable_cpus()
+        stride = self.config.worker_cpu_stride or max(
+            1, len(cpus) // self.config.workers
+        )
+        return [cpus[(i * stride) % len(cpus)] for i in range(self.config.workers)]
 
-            except KeyboardInterrupt:
-                logger.info("Shutdown requested")
-                break
-            except zmq.Again:
-                self._update_metrics()
-                continue
-            except zmq.ZMQError as exc:
-                logger.error("Transport error in main loop: %s", exc)
-                raise TransportError(str(exc)) from exc
-            except Exception as e:
-                logger.error(f"Error in main loop: {e}")
-                continue
-
-    def _handle_request(self, request: bytes) -> bytes:
-        """Handle one request and return encoded response bytes."""
+    def _pin_worker(self):
+        """Pin the calling worker thread to its CPU."""
+        worker_id = next(self._worker_ids)
+        cpu = self._worker_cpus[worker_id % len(self._worker_cpus)]
+        try:
+            # On Linux, pid 0 means the calling thread, not the whole process
+            os.sched_setaffinity(0, {cpu})
+        except (AttributeError, OSError) as exc:
+            logger.warning("Could not pin worker %d to CPU %d: %s", worker_id, cpu, exc)
+
+    def _run_proxy(self):
+        """Forward between frontend and workers until told to terminate.
+
+        zmq's proxy moves the frames in C without the GIL; the envelope
+        stays on them, so each reply finds its way back to its client.
+        """
         try:
-            data = json.loads(request.decode("utf-8"))
-        except json.JSONDecodeError as exc:
-            raise RequestValidationError("Invalid JSON payload") from exc
+            zmq.proxy_steerable(self.frontend, self.backend, None, self._proxy_control)
+        except zmq.ZMQError as exc:
+            logger.error("Transport error in proxy: %s", exc)
+
+    def _worker_loop(self):
+        """Serve requests forwarded by the proxy until shutdown."""
+        if self._worker_cpus:
+            self._pin_worker()
+        socket = self.context.socket(zmq.REP)
+        socket.connect(BACKEND_ENDPOINT)
+        # Bound once; the drain loop below runs once per request
+        serve = self._serve
+        recv = socket.recv_multipart
+        get = socket.get
+        try:
+            while self.running:
+                # Wake up periodically to notice shutdown requests
+                if not socket.poll(IDLE_POLL_MS):
+                    continue
+                # Then drain what is queued without a poll per request;
+                # ZMQ_EVENTS reads the socket state without a syscall
+                serve(socket, recv())
+                while self.running and get(zmq.EVENTS) & zmq.POLLIN:
+                    serve(socket, recv())
+        except zmq.ZMQError as exc:
+            logger.error("Transport error in worker: %s", exc)
+        finally:
+            socket.close(linger=0)
+
+    def _serve(self, socket: zmq.Socket, request: List[bytes]):
+        """Handle one request and send its reply.
+
+        The REP socket has already split off the routing envelope and puts
+        it back on the reply.
+        """
+        started = time.perf_counter()
+        try:
+            response = self._handle_request(request)
+        except Exception as exc:
+            # Unparseable requests still get a reply
+            logger.error(f"Error handling request: {exc}")
+            self._record_outcome(success=False)
+            response = self._error_response(exc)
+        elapsed = time.perf_counter() - started
+        self._request_duration.observe(elapsed)
+        ewma = self._processing_time_ewma
+        # The first request seeds the average instead of it rising from zero
+        self._processing_time_ewma = (
+            ewma + PROCESSING_TIME_ALPHA * (elapsed - ewma) if ewma else elapsed
+        )
+
+        try:
+            socket.send(response)
+        except zmq.ZMQError as exc:
+            logger.error("Failed to send reply: %s", exc)
+
+    def _handle_request(self, frames: List[bytes]) -> bytes:
+        """Handle one request and return encoded response bytes.
+
+        A single frame carries the whole JSON payload. Binary requests send
+        a MessagePack header frame followed by the matrix as a raw buffer
+        described by the header's ``matrix_shape`` and ``matrix_dtype``.
+        A three-dimensional shape carries a batch of matrices; the reply
+        then also lists one sum per matrix in ``matrix_sums``.
+
+        Requests whose first byte is a codec format id were encoded with
+        ``SerializationCodec`` (as one frame, or as header and payload
+        frames) and get their reply encoded the same way; their matrix may
+        arrive as a NumPy array.
+        """
+        if frames == [HEARTBEAT_REQUEST]:
+            # The JSON heartbeat the Lean client sends: answer from the
+            # precomputed template without parsing or encoding
+            return b"%s%r}" % (self._heartbeat_prefix, time.time())
+
+        codec_request = bool(frames[0]) and frames[0][0] in FORMAT_IDS
+        encode = self.codec.serialize if codec_request else _dumps
+        if codec_request:
+            try:
+                if len(frames) > 1:
+                    data = self.codec.deserialize_framed(frames[0], frames[1])
+                else:
+                    data = self.codec.deserialize(frames[0])
+            except Exception as exc:
+                self._record_outcome(success=False)
+                return self._error_response(
+                    RequestValidationError(f"Invalid codec payload: {exc}"),
+                    encode=encode,
+                )
+        elif len(frames) > 1:
+            try:
+                data = msgpack.unpackb(frames[0], raw=False)
+            except ValueError as exc:
+                raise RequestValidationError("Invalid MessagePack header") from exc
+        else:
+            try:
+                # orjson parses the frame bytes directly, no str decode
+                data = orjson.loads(frames[0])
+            except orjson.JSONDecodeError as exc:
+                raise RequestValidationError("Invalid JSON payload") from exc
 
         if data == "HEARTBEAT":
-            return json.dumps(
-                {"status": "heartbeat_ack", "timestamp": time.time(), "server_id": f"server_{id(self)}"}
-            ).encode("utf-8")
+            return encode(
+                {
+                    "status": "heartbeat_ack",
+                    "timestamp": time.time(),
+                    "server_id": self._server_id,
+                }
+            )
 
         if isinstance(data, dict) and "payload" in data:
             correlation_id = data.get("correlation_id")
@@ -165,47 +461,88 @@ class AdvancedServer:
             payload = data
 
         try:
-            validate_matrix_model(payload)
-            matrix = payload["matrix"]
+            matrix_sums = None
+            if codec_request and isinstance(payload.get("matrix"), np.ndarray):
+                schema_version = self._validate_array(payload)
+                np_mat = payload["matrix"]
+            elif len(frames) > 1 and not codec_request:
+                schema_version = self._validate_frame(payload, frames[1])
+                np_mat = np.frombuffer(
+                    frames[1], dtype=payload["matrix_dtype"]
+                ).reshape(payload["matrix_shape"])
+            elif "matrix_bin" in payload and "matrix" not in payload:
+                schema_version = self._validate_model(payload)
+                np_mat = _decode_matrix_bin(payload["matrix_bin"])
+            else:
+                schema_version = self._validate_model(payload)
+                np_mat = None
+                matrix_sum, shape = _sum_rows(payload["matrix"])
+                data_type = "int64"
+            if np_mat is not None:
+                shape = np_mat.shape
+                data_type = np_mat.dtype.name
+                acc = _sum_dtype(np_mat)
+                if np_mat.ndim == 3:
+                    # One pass over the batch; the total is the sum of the sums
+                    matrix_sums = np_mat.sum(axis=(1, 2), dtype=acc)
+                    matrix_sum = float(matrix_sums.sum())
+                else:
+                    matrix_sum = float(np_mat.sum(dtype=acc))
             model_info = payload["model"]
-            schema_version = payload.get("schema_version", 1)
-            np_mat = np.array(matrix, dtype=np.float64)
             body = {
                 "status": "success",
-                "matrix_sum": float(np_mat.sum()),
+                "matrix_sum": matrix_sum,
                 "model_checked": model_info["name"],
                 "schema_version_used": schema_version,
                 "timestamp": time.time(),
-                "matrix_shape": list(np_mat.shape),
-                "data_type": str(np_mat.dtype),
+                "matrix_shape": shape,
+                "data_type": data_type,
             }
+            if matrix_sums is not None:
+                body["batch_size"] = shape[0]
+                # Replies report sums as floats whatever the accumulator
+                body["matrix_sums"] = matrix_sums.astype(np.float64).tolist()
             if correlation_id is not None:
                 body["correlation_id"] = correlation_id
-            self.metrics["requests_total"] += 1
-            self.metrics["requests_success"] += 1
-            self._requests_total.inc()
-            self._requests_success.inc()
-            return json.dumps(body).encode("utf-8")
+            self._record_outcome(success=True)
+            return encode(body)
         except Exception as exc:
+            self._record_outcome(success=False)
+            return self._error_response(exc, correlation_id, encode)
+
+    def _error_response(
+        self,
+        exc: Exception,
+        correlation_id: Any = None,
+        encode: Callable[[Any], bytes] = _dumps,
+    ) -> bytes:
+        """Encode the error reply for a failed request."""
+        error_body = {
+            "status": "error",
+            "message": str(exc),
+            "timestamp": time.time(),
+        }
+        if correlation_id is not None:
+            error_body["correlation_id"] = correlation_id
+        return encode(error_body)
+
+    def _record_outcome(self, success: bool):
+        """Count one finished request."""
+        with self._metrics_lock:
             self.metrics["requests_total"] += 1
-            self.metrics["requests_error"] += 1
-            self._requests_total.inc()
+            if success:
+                self.metrics["requests_success"] += 1
+            else:
+                self.metrics["requests_error"] += 1
+        self._requests_total.inc()
+        if success:
+            self._requests_success.inc()
+        else:
             self._requests_error.inc()
-            error_body = {
-                "status": "error",
-                "message": str(exc),
-                "timestamp": time.time(),
-            }
-            if correlation_id is not None:
-                error_body["correlation_id"] = correlation_id
-            return json.dumps(error_body).encode("utf-8")
 
     def _update_metrics(self):
         """Update server metrics"""
-        if self.processing_count > 0:
-            self.metrics["avg_processing_time"] = (
-                self.processing_time_total / self.processing_count
-            )
+        self.metrics["avg_processing_time"] = self._processing_time_ewma
         self._uptime_seconds.set(time.time() - self.start_time)
 
     def get_metrics(self) -> Dict[str, Any]:
@@ -223,10 +560,25 @@ class AdvancedServer:
         """Clean up server resources"""
         self.running = False
 
+        # Workers finish the request in hand and exit at their next poll
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+        if self._proxy_thread is not None:
+            self._control.send(b"TERMINATE")
+            self._proxy_thread.join()
+            self._proxy_thread = None
+        for name in ("backend", "_proxy_control", "_control"):
+            socket = getattr(self, name)
+            if socket is not None:
+                socket.close(linger=0)
+                setattr(self, name, None)
         if self.frontend is not None:
             self.frontend.close()
+            self.frontend = None
         if self.context is not None:
             self.context.term()
+            self.context = None
 
         logger.info("Server cleanup completed")
 
@@ -236,17 +588,49 @@ def main():
     parser = argparse.ArgumentParser(description="Advanced Lean-Python Bridge Server")
     parser.add_argument("--dev", action="store_true", help="Development mode")
     parser.add_argument("--endpoint", default="tcp://*:5555", help="ZMQ endpoint")
-    parser.add_argument("--metrics-port", type=int, default=8000, help="Prometheus metrics port")
+    parser.add_argument(
+        "--ipc-endpoint",
+        default=ServerConfig.ipc_endpoint,
+        help="Additional ZMQ ipc endpoint for local clients ('' to disable)",
+    )
+    parser.add_argument(
+        "--metrics-port", type=int, default=8000, help="Prometheus metrics port"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=ServerConfig.workers,
+        help="Threads handling requests",
+    )
+    parser.add_argument(
+        "--pin-workers",
+        action="store_true",
+        default=ServerConfig.pin_workers,
+        help="Pin each worker thread to its own CPU (Linux)",
+    )
+    parser.add_argument(
+        "--trust-clients",
+        action="store_true",
+        default=ServerConfig.trust_clients,
+        help="Skip JSON-Schema validation of requests",
+    )
 
     args = parser.parse_args()
 
     # Configuration
-    config = ServerConfig(
-        endpoint=args.endpoint,
-        enable_metrics=True,
-        metrics_port=args.metrics_port,
-        enable_curve=not args.dev,
-    )
+    try:
+        config = ServerConfig(
+            endpoint=args.endpoint,
+            ipc_endpoint=args.ipc_endpoint,
+            enable_metrics=True,
+            metrics_port=args.metrics_port,
+            workers=args.workers,
+            pin_workers=args.pin_workers,
+            trust_clients=args.trust_clients,
+            enable_curve=not args.dev,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
 
     # Create and start server
     server = AdvancedServer(config)
@@ -1,4 +1,21 @@
-import jsonschema
+import math
+from typing import Sequence
+
+import fastjsonschema
+
+# Integer dtypes accepted for matrices sent as a raw binary frame (or as
+# matrix_bin), with their item sizes in bytes. A frame holds one matrix of
+# shape (rows, cols) or a batch of matrices of shape (batch, rows, cols).
+MATRIX_FRAME_DTYPES = {
+    "int8": 1,
+    "int16": 2,
+    "int32": 4,
+    "int64": 8,
+    "uint8": 1,
+    "uint16": 2,
+    "uint32": 4,
+    "uint64": 8,
+}
 
 matrix_model_schema_v1 = {
     "type": "object",
@@ -34,16 +51,113 @@ matrix_model_schema_v2 = {
             },
             "required": ["name", "version"],
         },
+        # Alternative to matrix: the raw buffer of a rows x cols matrix,
+        # base64-encoded, for clients limited to a single JSON frame
+        "matrix_bin": {
+            "type": "object",
+            "properties": {
+                "rows": {"type": "integer", "minimum": 0},
+                "cols": {"type": "integer", "minimum": 0},
+                "dtype": {"type": "string", "enum": sorted(MATRIX_FRAME_DTYPES)},
+                "data": {"type": "string"},
+            },
+            "required": ["rows", "cols", "dtype", "data"],
+        },
     },
-    "required": ["schema_version", "matrix", "model"],
+    "required": ["schema_version", "model"],
+    "anyOf": [{"required": ["matrix"]}, {"required": ["matrix_bin"]}],
+}
+
+
+def _matrix_frame_schema(schema: dict) -> dict:
+    """Derive a header schema for binary matrix frames from a JSON schema."""
+    properties = {
+        k: v
+        for k, v in schema["properties"].items()
+        if k not in ("matrix", "matrix_bin")
+    }
+    properties["matrix_shape"] = {
+        "type": "array",
+        "items": {"type": "integer", "minimum": 0},
+        "minItems": 2,
+        "maxItems": 3,
+    }
+    properties["matrix_dtype"] = {
+        "type": "string",
+        "enum": sorted(MATRIX_FRAME_DTYPES),
+    }
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": ["schema_version", "matrix_shape", "matrix_dtype", "model"],
+    }
+
+
+matrix_frame_schema_v1 = _matrix_frame_schema(matrix_model_schema_v1)
+matrix_frame_schema_v2 = _matrix_frame_schema(matrix_model_schema_v2)
+
+
+# Validators are generated once at import; fastjsonschema compiles each
+# schema to Python code instead of walking it on every call.
+# JsonSchemaException, raised on invalid payloads, is a ValueError.
+_MODEL_VALIDATORS = {
+    1: fastjsonschema.compile(matrix_model_schema_v1),
+    2: fastjsonschema.compile(matrix_model_schema_v2),
 }
+_FRAME_VALIDATORS = {
+    1: fastjsonschema.compile(matrix_frame_schema_v1),
+    2: fastjsonschema.compile(matrix_frame_schema_v2),
+}
+
 
+def load_schemas() -> dict:
+    """Return the JSON request schemas by version name."""
+    return {"v1": matrix_model_schema_v1, "v2": matrix_model_schema_v2}
 
-def validate_matrix_model(payload: dict) -> None:
+
+def _validate(validators: dict, payload: dict) -> int:
     version = payload.get("schema_version", 1)
-    if version == 1:
-        jsonschema.validate(instance=payload, schema=matrix_model_schema_v1)
-    elif version == 2:
-        jsonschema.validate(instance=payload, schema=matrix_model_schema_v2)
-    else:
+    validator = validators.get(version)
+    if validator is None:
         raise ValueError(f"Unsupported schema version: {version}")
+    validator(payload)
+    return version
+
+
+def validate_matrix_model(payload: dict) -> int:
+    """Validate a JSON request and return its schema version."""
+    return _validate(_MODEL_VALIDATORS, payload)
+
+
+def _validate_frame_header(header: dict) -> int:
+    return _validate(_FRAME_VALIDATORS, header)
+
+
+def validate_matrix_frame(header: dict, buffer: bytes) -> int:
+    """Validate the header of a binary matrix request against its data frame.
+
+    Returns the header's schema version.
+    """
+    version = _validate_frame_header(header)
+    validate_matrix_buffer(header["matrix_shape"], header["matrix_dtype"], buffer)
+    return version
+
+
+def validate_matrix_buffer(shape: Sequence[int], dtype: str, buffer: bytes) -> None:
+    """Check that a raw matrix buffer holds exactly shape x dtype."""
+    expected = math.prod(shape) * MATRIX_FRAME_DTYPES[dtype]
+    if len(buffer) != expected:
+        raise ValueError(f"Matrix frame has {len(buffer)} bytes, expected {expected}")
+
+
+def validate_matrix_array(payload: dict) -> int:
+    """Validate a request whose matrix was decoded as a NumPy array.
+
+    The array's own shape and dtype stand in for the binary frame header.
+    Returns the request's schema version.
+    """
+    matrix = payload["matrix"]
+    header = {k: v for k, v in payload.items() if k != "matrix"}
+    header["matrix_shape"] = list(matrix.shape)
+    header["matrix_dtype"] = matrix.dtype.name
+    return _validate_frame_header(header)
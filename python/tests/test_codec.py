@@ -1,6 +1,7 @@
+import numpy as np
 import pytest
 
-from src.codec import SerializationCodec
+from src.codec import JSON_IMPLS, CodecConfig, SerializationCodec
 
 
 def test_protobuf_round_trip():
@@ -20,3 +21,117 @@ def test_unknown_header_rejected():
     codec = SerializationCodec()
     with pytest.raises(ValueError):
         codec.deserialize(b"\xffpayload")
+
+
+@pytest.mark.parametrize("json_impl", JSON_IMPLS)
+def test_json_special_floats_round_trip(json_impl):
+    codec = SerializationCodec(CodecConfig(json_impl=json_impl))
+    payload = {"matrix": [[1.0, float("inf")]], "bias": float("nan"), "tag": None}
+    decoded = codec.deserialize(codec.serialize(payload, format_override="json"))
+    assert decoded["matrix"] == [[1.0, float("inf")]]
+    assert decoded["bias"] != decoded["bias"]
+    assert decoded["tag"] is None
+
+
+@pytest.mark.parametrize("json_impl", JSON_IMPLS)
+def test_json_special_float_strings(json_impl):
+    codec = SerializationCodec(CodecConfig(json_impl=json_impl))
+    decoded = codec.deserialize(b'\x01{"lo":"-Infinity","x":{"y":"NaN"},"n":1}')
+    assert decoded["lo"] == float("-inf")
+    assert decoded["x"]["y"] != decoded["x"]["y"]
+    assert decoded["n"] == 1
+
+
+def test_serialize_cached_reuses_bytes_per_object():
+    codec = SerializationCodec()
+    payload = {"schema_version": 1, "matrix": [[1, 2], [3, 4]]}
+    blob = codec.serialize_cached(payload, "req")
+    assert codec.serialize_cached(payload, "req") is blob
+
+    # An equal but distinct object is serialized afresh
+    other = {"schema_version": 1, "matrix": [[1, 2], [3, 4]]}
+    assert codec.serialize_cached(other, "req") is not blob
+    assert codec.deserialize(codec.serialize_cached(other, "req")) == payload
+
+    codec.clear_cache()
+    assert codec.serialize_cached(other, "req") == blob
+
+
+def test_serialize_cached_respects_format_override():
+    codec = SerializationCodec()
+    payload = {"schema_version": 1, "matrix": [[1, 2], [3, 4]]}
+    as_json = codec.serialize_cached(payload, "req", format_override="json")
+    as_msgpack = codec.serialize_cached(payload, "req", format_override="msgpack")
+    assert as_json != as_msgpack
+    assert codec.deserialize(as_json) == payload
+    assert codec.deserialize(as_msgpack) == payload
+
+
+def test_msgpack_ndarray_round_trip():
+    codec = SerializationCodec()
+    matrix = np.arange(12, dtype=np.float32).reshape(3, 4)
+    blob = codec.serialize({"matrix": matrix}, format_override="msgpack")
+    decoded = codec.deserialize(blob)
+    assert decoded["matrix"].dtype == np.float32
+    np.testing.assert_array_equal(decoded["matrix"], matrix)
+
+
+def test_framed_round_trip():
+    codec = SerializationCodec()
+    payload = {"schema_version": 1, "matrix": [[1, 2], [3, 4]]}
+    header, body = codec.serialize_framed(payload, format_override="msgpack")
+    assert header + body == codec.serialize(payload, format_override="msgpack")
+    assert codec.deserialize_framed(header, body) == payload
+
+
+def test_matrix_array_format_selection():
+    codec = SerializationCodec()
+    small = codec.serialize({"matrix": np.ones((2, 2))})
+    large = codec.serialize({"matrix": np.ones((1000, 1000))})
+    assert small[0] == 1  # json
+    assert large[0] == 6  # split_numeric, even above the protobuf threshold
+
+
+def test_small_non_finite_matrix_skips_json():
+    codec = SerializationCodec()
+    matrix = np.array([[1.0, np.nan], [np.inf, -np.inf]])
+    blob = codec.serialize({"matrix": matrix})
+    assert blob[0] == 6
+    np.testing.assert_array_equal(codec.deserialize(blob)["matrix"], matrix)
+
+
+def test_split_numeric_round_trip():
+    codec = SerializationCodec()
+    matrix = np.arange(2 * 30 * 40, dtype=np.int32).reshape(2, 30, 40)
+    payload = {"schema_version": 1, "matrix": matrix, "model": {"name": "S"}}
+    blob = codec.serialize(payload)
+    assert blob[0] == 6
+    assert codec.serialize_framed(payload) == (blob[:1], blob[1:])
+
+    decoded = codec.deserialize(blob)
+    assert decoded["matrix"].dtype == np.int32
+    np.testing.assert_array_equal(decoded["matrix"], matrix)
+    assert decoded["model"] == {"name": "S"}
+    assert decoded["schema_version"] == 1
+
+
+@pytest.mark.parametrize(
+    "quantize_dtype, header, tolerance",
+    [("float16", 4, 1e-3), ("int8", 5, 1 / 127)],
+)
+def test_quantized_large_matrix(quantize_dtype, header, tolerance):
+    codec = SerializationCodec(
+        CodecConfig(
+            json_threshold=10,
+            msgpack_threshold=100,
+            quantize_large=True,
+            quantize_dtype=quantize_dtype,
+        )
+    )
+    matrix = np.random.default_rng(0).uniform(-1, 1, (20, 20))
+    blob = codec.serialize({"matrix": matrix, "model": {"name": "Q"}})
+    assert blob[0] == header
+    decoded = codec.deserialize(blob)
+    assert decoded["matrix"].dtype == np.float64
+    assert decoded["model"] == {"name": "Q"}
+    np.testing.assert_allclose(decoded["matrix"], matrix, atol=tolerance)
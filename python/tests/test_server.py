@@ -1,127 +1,359 @@
+import os
+import queue
 import subprocess
-import time
+import threading
 import zmq
 import json
 import pytest
-import socket
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 
+BOUND_LOG_PREFIX = "Server sockets bound to "
+STARTUP_TIMEOUT = 10  # seconds
 
-def is_port_open(port):
-    """Check if a port is open"""
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.settimeout(1)
-            result = s.connect_ex(("127.0.0.1", port))
-            return result == 0
-    except Exception:
-        return False
 
+def _drain_log(stream, bound: queue.Queue):
+    """Report the bound endpoint, then keep reading so the pipe never fills"""
+    for line in stream:
+        if BOUND_LOG_PREFIX in line:
+            bound.put(line.split(BOUND_LOG_PREFIX, 1)[1].split(",")[0].strip())
+    # Unblocks the fixture if the server exits without binding
+    bound.put(None)
+    stream.close()
 
-@pytest.fixture(scope="module")
-def zmq_server():
-    """Start an isolated server subprocess and cleanly tear it down."""
-    if is_port_open(5555):
-        pytest.skip("Port 5555 already in use; refusing to kill unrelated processes.")
 
-    # Start server
+@contextmanager
+def _run_server(*args):
+    """Run the server on an ephemeral port and yield its TCP endpoint.
+
+    The server logs where it is listening, so tests never wait on or
+    collide with a fixed port.
+    """
     proc = subprocess.Popen(
-        [sys.executable, "src/server.py", "--dev", "--metrics-port", "8001"],
+        [
+            sys.executable,
+            "src/server.py",
+            "--dev",
+            "--endpoint",
+            "tcp://127.0.0.1:0",
+            "--ipc-endpoint",
+            "",
+            "--metrics-port",
+            "0",
+            *args,
+        ],
         cwd=str(Path(__file__).resolve().parents[1]),
-        stdout=subprocess.PIPE,
+        env={**os.environ, "LOG_LEVEL": "INFO"},
+        stdout=subprocess.DEVNULL,
         stderr=subprocess.PIPE,
+        text=True,
     )
+    bound: queue.Queue = queue.Queue()
+    threading.Thread(target=_drain_log, args=(proc.stderr, bound), daemon=True).start()
 
-    # Wait for server to start with timeout
-    max_wait = 10
-    while not is_port_open(5555) and max_wait > 0:
-        time.sleep(0.5)
-        max_wait -= 1
-
-    if not is_port_open(5555):
-        proc.terminate()
-        pytest.fail("Server failed to start within timeout")
+    try:
+        # Sockets are bound before the server starts its workers
+        try:
+            endpoint = bound.get(timeout=STARTUP_TIMEOUT)
+        except queue.Empty:
+            endpoint = None
+        if endpoint is None:
+            pytest.fail("Server did not bind its endpoint within timeout")
+        yield endpoint
+    finally:
+        # Cleanup
+        try:
+            proc.terminate()
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
 
-    yield proc
 
-    # Cleanup
-    try:
-        proc.terminate()
-        proc.wait(timeout=5)
-    except subprocess.TimeoutExpired:
-        proc.kill()
+@pytest.fixture(scope="module")
+def zmq_server():
+    """Start an isolated server subprocess and yield its TCP endpoint."""
+    with _run_server() as endpoint:
+        yield endpoint
 
 
-def test_v1_sum(zmq_server):
-    """Test v1 schema matrix sum"""
+@pytest.fixture(scope="module")
+def zmq_context():
+    """One ZMQ context (and its IO thread) shared by the module's clients"""
     context = zmq.Context()
+    yield context
+    context.term()
+
+
+@pytest.fixture(scope="module")
+def trusted_server():
+    """Server started with --trust-clients, which skips schema validation"""
+    with _run_server("--trust-clients") as endpoint:
+        yield endpoint
+
+
+def _connect(context, endpoint):
+    """REQ socket connected to endpoint, closed without lingering"""
     socket = context.socket(zmq.REQ)
+    socket.setsockopt(zmq.LINGER, 0)
     socket.setsockopt(zmq.RCVTIMEO, 5000)  # 5 second timeout
     socket.setsockopt(zmq.SNDTIMEO, 5000)  # 5 second timeout
+    socket.connect(endpoint)
+    return socket
 
-    try:
-        socket.connect("tcp://127.0.0.1:5555")
-
-        data = {
-            "schema_version": 1,
-            "matrix": [[1, 2], [3, 4]],
-            "model": {"name": "TestModel", "version": "0.1"},
-        }
-        socket.send_string(json.dumps(data))
-        reply_str = socket.recv_string()
-        reply = json.loads(reply_str)
-
-        assert reply["status"] == "success"
-        assert reply["matrix_sum"] == 10.0
-        assert reply["model_checked"] == "TestModel"
-    finally:
-        socket.close()
-        context.term()
+
+@pytest.fixture
+def client(zmq_context, zmq_server):
+    """REQ socket connected to the test server"""
+    socket = _connect(zmq_context, zmq_server)
+    yield socket
+    socket.close()
 
 
-def test_v2_schema(zmq_server):
+@pytest.fixture
+def trusted_client(zmq_context, trusted_server):
+    """REQ socket connected to the --trust-clients test server"""
+    socket = _connect(zmq_context, trusted_server)
+    yield socket
+    socket.close()
+
+
+def test_v1_sum(zmq_server, client):
+    """Test v1 schema matrix sum"""
+    data = {
+        "schema_version": 1,
+        "matrix": [[1, 2], [3, 4]],
+        "model": {"name": "TestModel", "version": "0.1"},
+    }
+    client.send_string(json.dumps(data))
+    reply_str = client.recv_string()
+    reply = json.loads(reply_str)
+
+    assert reply["status"] == "success"
+    assert reply["matrix_sum"] == 10.0
+    assert reply["model_checked"] == "TestModel"
+    # Compact JSON: the Lean client matches this substring verbatim
+    assert '"status":"success"' in reply_str
+
+
+def test_v2_schema(zmq_server, client):
     """Test v2 schema with additional fields"""
-    context = zmq.Context()
-    socket = context.socket(zmq.REQ)
-    socket.setsockopt(zmq.RCVTIMEO, 5000)  # 5 second timeout
-    socket.setsockopt(zmq.SNDTIMEO, 5000)  # 5 second timeout
+    data = {
+        "schema_version": 2,
+        "matrix": [[1, 2], [3, 4]],
+        "model": {"name": "AnotherModel", "version": "1.2", "author": "Jane Doe"},
+    }
+    client.send_string(json.dumps(data))
+    reply_str = client.recv_string()
+    reply = json.loads(reply_str)
 
-    try:
-        socket.connect("tcp://127.0.0.1:5555")
-
-        data = {
-            "schema_version": 2,
-            "matrix": [[1, 2], [3, 4]],
-            "model": {"name": "AnotherModel", "version": "1.2", "author": "Jane Doe"},
-        }
-        socket.send_string(json.dumps(data))
-        reply_str = socket.recv_string()
-        reply = json.loads(reply_str)
-
-        assert reply["status"] == "success"
-        assert reply["matrix_sum"] == 10.0
-        assert reply["model_checked"] == "AnotherModel"
-        assert reply["schema_version_used"] == 2
-    finally:
-        socket.close()
-        context.term()
+    assert reply["status"] == "success"
+    assert reply["matrix_sum"] == 10.0
+    assert reply["model_checked"] == "AnotherModel"
+    assert reply["schema_version_used"] == 2
+
+
+def test_ragged_matrix_rejected(zmq_server, client):
+    """Rows of different lengths are an error, not a partial sum"""
+    data = {
+        "schema_version": 1,
+        "matrix": [[1, 2], [3]],
+        "model": {"name": "TestModel", "version": "0.1"},
+    }
+    client.send_string(json.dumps(data))
+    reply = json.loads(client.recv_string())
+    assert reply["status"] == "error"
+
+
+def test_v2_matrix_bin(zmq_server, client):
+    """Test v2 matrix sent as a base64 raw buffer inside the JSON payload"""
+    import base64
+    import numpy as np
+
+    matrix = np.array([[1, 2], [3, 4]], dtype=np.int64)
+    data = {
+        "schema_version": 2,
+        "matrix_bin": {
+            "rows": 2,
+            "cols": 2,
+            "dtype": "int64",
+            "data": base64.b64encode(matrix.tobytes()).decode("ascii"),
+        },
+        "model": {"name": "AnotherModel", "version": "1.2"},
+    }
+    client.send_string(json.dumps(data))
+    reply = json.loads(client.recv_string())
+
+    assert reply["status"] == "success"
+    assert reply["matrix_sum"] == 10.0
+    assert reply["data_type"] == "int64"
+
+    data["matrix_bin"]["rows"] = 3
+    client.send_string(json.dumps(data))
+    reply = json.loads(client.recv_string())
+
+    assert reply["status"] == "error"
 
 
-def test_server_health(zmq_server):
+def test_binary_matrix_frame(zmq_server, client):
+    """Test matrix sent as a raw buffer next to a MessagePack header"""
+    import msgpack
+    import numpy as np
+
+    matrix = np.arange(1, 7, dtype=np.uint8).reshape(2, 3)
+    header = {
+        "schema_version": 1,
+        "matrix_shape": [2, 3],
+        "matrix_dtype": "uint8",
+        "model": {"name": "BinaryModel", "version": "0.1"},
+    }
+    client.send_multipart([msgpack.packb(header), matrix.tobytes()])
+    reply = json.loads(client.recv_string())
+
+    assert reply["status"] == "success"
+    assert reply["matrix_sum"] == 21.0
+    assert reply["matrix_shape"] == [2, 3]
+    assert reply["data_type"] == "uint8"
+
+    header["matrix_shape"] = [2, 1, 3]
+    client.send_multipart([msgpack.packb(header), matrix.tobytes()])
+    reply = json.loads(client.recv_string())
+
+    assert reply["status"] == "success"
+    assert reply["batch_size"] == 2
+    assert reply["matrix_sums"] == [6.0, 15.0]
+
+    header["matrix_shape"] = [3, 3]
+    client.send_multipart([msgpack.packb(header), matrix.tobytes()])
+    reply = json.loads(client.recv_string())
+
+    assert reply["status"] == "error"
+
+    # An int64 sum that would wrap around in an int64 accumulator
+    large = np.full((1, 2), 2**62, dtype=np.int64)
+    header["matrix_shape"] = [1, 2]
+    header["matrix_dtype"] = "int64"
+    client.send_multipart([msgpack.packb(header), large.tobytes()])
+    reply = json.loads(client.recv_string())
+
+    assert reply["status"] == "success"
+    assert reply["matrix_sum"] == 2.0**63
+
+
+def test_codec_request(zmq_server, client):
+    """Test requests encoded with SerializationCodec get codec-encoded replies"""
+    import numpy as np
+    from src.codec import SerializationCodec
+
+    codec = SerializationCodec()
+
+    data = {
+        "schema_version": 1,
+        "matrix": np.ones((40, 40), dtype=np.int32),
+        "model": {"name": "CodecModel", "version": "0.1"},
+    }
+    client.send(codec.serialize(data))
+    reply = codec.deserialize(client.recv())
+
+    assert reply["status"] == "success"
+    assert reply["matrix_sum"] == 1600.0
+    assert reply["model_checked"] == "CodecModel"
+    assert reply["data_type"] == "int32"
+
+    data["matrix"] = [[1, 2], [3, 4]]
+    header, payload = codec.serialize_framed(data)
+    client.send_multipart([header, payload])
+    reply = codec.deserialize(client.recv())
+
+    assert reply["status"] == "success"
+    assert reply["matrix_sum"] == 10.0
+
+    data["matrix"] = np.full((2, 2), 0.5)
+    client.send(codec.serialize(data))
+    reply = codec.deserialize(client.recv())
+
+    assert reply["status"] == "error"
+
+
+def test_quantized_request_rejected(zmq_server, client):
+    """Quantized matrices decode as floats, which requests may not carry"""
+    import numpy as np
+    from src.codec import SerializationCodec
+
+    codec = SerializationCodec()
+    data = {
+        "schema_version": 1,
+        "matrix": np.ones((4, 4)),
+        "model": {"name": "QuantModel", "version": "0.1"},
+    }
+    for format_name in ("quantized_f16", "quantized_int8"):
+        client.send(codec.serialize(data, format_override=format_name))
+        reply = codec.deserialize(client.recv())
+
+        assert reply["status"] == "error"
+
+
+def test_invalid_payload_gets_error_reply(zmq_server, client):
+    """Unparseable requests are answered instead of leaving the client waiting"""
+    client.send(b"{not json")
+    reply = json.loads(client.recv_string())
+    assert reply["status"] == "error"
+
+
+def test_trusted_clients(trusted_client):
+    """--trust-clients skips the schema but malformed data still gets errors"""
+    import base64
+
+    import numpy as np
+
+    data = {
+        "schema_version": 1,
+        "matrix": [[1, 2], [3, 4]],
+        "model": {"name": "TestModel", "version": "0.1"},
+    }
+    trusted_client.send_string(json.dumps(data))
+    reply = json.loads(trusted_client.recv_string())
+
+    assert reply["status"] == "success"
+    assert reply["matrix_sum"] == 10.0
+
+    # The buffer is still checked against the declared shape
+    matrix = np.array([[1, 2], [3, 4]], dtype=np.int64)
+    bin_data = {
+        "schema_version": 2,
+        "matrix_bin": {
+            "rows": 3,
+            "cols": 2,
+            "dtype": "int64",
+            "data": base64.b64encode(matrix.tobytes()).decode("ascii"),
+        },
+        "model": {"name": "AnotherModel", "version": "1.2"},
+    }
+    trusted_client.send_string(json.dumps(bin_data))
+    reply = json.loads(trusted_client.recv_string())
+
+    assert reply["status"] == "error"
+
+    for bad_matrix in ([[1, "x"], [3, 4]], "not a matrix", None):
+        data["matrix"] = bad_matrix
+        trusted_client.send_string(json.dumps(data))
+        reply = json.loads(trusted_client.recv_string())
+
+        assert reply["status"] == "error"
+
+    # The server is still serving after the failed requests
+    trusted_client.send_string(json.dumps("HEARTBEAT"))
+    reply = json.loads(trusted_client.recv_string())
+    assert reply["status"] == "heartbeat_ack"
+
+
+def test_server_health(zmq_server, client):
     """Health probe over ZMQ heartbeat contract."""
-    context = zmq.Context()
-    client = context.socket(zmq.REQ)
-    client.setsockopt(zmq.RCVTIMEO, 3000)
-    client.connect("tcp://127.0.0.1:5555")
-    try:
-        client.send_string(json.dumps("HEARTBEAT"))
-        reply = json.loads(client.recv_string())
-        assert reply["status"] == "heartbeat_ack"
-        assert "timestamp" in reply
-    finally:
-        client.close()
-        context.term()
+    client.send_string(json.dumps("HEARTBEAT"))
+    reply = json.loads(client.recv_string())
+    assert reply["status"] == "heartbeat_ack"
+    assert "timestamp" in reply
 
 
 def test_validation_schemas():
@@ -135,10 +367,10 @@ def test_validation_schemas():
 
 def test_imports():
     """Test that all required modules can be imported"""
-    import zmq
-    import jsonschema
+    import fastjsonschema
     import numpy
+    import zmq
 
     assert zmq is not None
-    assert jsonschema is not None
+    assert fastjsonschema is not None
     assert numpy is not None